@@ -1,87 +1,245 @@
+import os, re, math, shlex, subprocess, threading, time, functools, queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from multiprocessing import Queue
 from typing import List, Dict, Tuple, Optional
 
 from utils import (
-    _run_capture, _has_adb_ok, _find_adb_in_tools
+    _run_capture, _run_stream, _has_adb_ok, _find_adb_in_tools, _safe_decode, _WIN_NO_WINDOW
 )
 
 _ADB_OVERRIDE: Optional[str] = None
+_ADB_OVERRIDE_OK: bool = False
 _ADB_EMITTED_PATH: Optional[str] = None
+_ADB_EMITTED_PATH_NORM: Optional[str] = None
+_ADB_RESOLVED: Optional[str] = None
+_READY_SAMPLES: deque = deque(maxlen=32)
+
+_has_adb_ok_cached = functools.lru_cache(maxsize=1)(_has_adb_ok)
+_find_adb_in_tools_cached = functools.lru_cache(maxsize=1)(_find_adb_in_tools)
+_MODEL_CACHE: Dict[str, str] = {}
+_SHELL_SESSIONS: Dict[str, "AdbShellSession"] = {}
+_READY_SERIALS: set = set()
+_MODEL_POOL: Optional[ThreadPoolExecutor] = None
+_SHELL_FAILED: set = set()
+
+_GETPROP_RE = re.compile(r'^\[([^\]]+)\]:\s*\[([^\]]*)\]')
+_MODEL_PROP_KEYS = ("ro.product.model", "ro.product.name", "ro.product.device", "ro.serialno")
+_SHELL_END_RE = re.compile(rb'__RVGUI_END_(\d+)__\r?\n?$')
+_SHELL_TIMEOUT = 10.0
+_VALID_STATES = frozenset({"device","unauthorized","offline","recovery","sideload","bootloader"})
+_SILENT_CONTEXTS = frozenset({"env_check", "init"})
+_STATE_TIPS = {
+    "unauthorized": "디바이스에서 USB 디버깅을 승인해 주세요.",
+    "offline": "USB 케이블/드라이버 점검 후 재연결해 주세요.",
+    "recovery": "일반 부팅 상태로 전환 후 다시 시도해 주세요.",
+    "sideload": "일반 부팅 상태로 전환 후 다시 시도해 주세요.",
+    "bootloader": "일반 부팅 상태로 전환 후 다시 시도해 주세요.",
+}
+_DAEMON_DOWN_RE = re.compile(r'daemon not running|cannot connect to daemon|connection refused', re.I)
+
+class AdbShellSession:
+    def __init__(self, adb_path: str, serial: str):
+        self.serial = serial
+        self._lock = threading.Lock()
+        self._proc = subprocess.Popen(
+            [adb_path, "-s", serial, "shell"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            creationflags=_WIN_NO_WINDOW
+        )
+        self._lines: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self):
+        for line in iter(self._proc.stdout.readline, b''):
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def run(self, args: List[str], timeout: float = _SHELL_TIMEOUT) -> Tuple[int, str, str]:
+        cmd = " ".join(shlex.quote(a) for a in args)
+        with self._lock:
+            self._proc.stdin.write(f"{cmd} 2>&1; echo __RVGUI_END_$?__\n".encode("utf-8"))
+            self._proc.stdin.flush()
+            deadline = time.monotonic() + timeout
+            buf = bytearray()
+            while True:
+                try:
+                    line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._proc.kill()
+                    raise TimeoutError(f"adb shell session timed out ({self.serial})")
+                if not line:
+                    raise OSError(f"adb shell session closed ({self.serial})")
+                m = _SHELL_END_RE.search(line)
+                if m:
+                    buf.extend(line[:m.start()])
+                    return int(m.group(1)), _safe_decode(bytes(buf)), ""
+                buf.extend(line)
+
+    def close(self):
+        try:
+            self._proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            self._proc.wait(timeout=2)
+        except Exception:
+            self._proc.kill()
 
 def emit_adb_path_set(out_q: Queue, path: Optional[str], ok: bool = True):
-    global _ADB_EMITTED_PATH
+    global _ADB_EMITTED_PATH, _ADB_EMITTED_PATH_NORM
     if not path:
         return
+    if _ADB_EMITTED_PATH:
+        try:
+            if os.path.samefile(path, _ADB_EMITTED_PATH):
+                return
+        except OSError:
+            pass
     try:
         newp = str(Path(path).resolve())
-        oldp = str(Path(_ADB_EMITTED_PATH).resolve()) if _ADB_EMITTED_PATH else None
     except Exception:
         newp = path
-        oldp = _ADB_EMITTED_PATH
-    if oldp and oldp == newp:
+    norm = os.path.normcase(os.path.normpath(newp))
+    if norm == _ADB_EMITTED_PATH_NORM:
         return
     _ADB_EMITTED_PATH = newp
+    _ADB_EMITTED_PATH_NORM = norm
     out_q.put({"type": "adb_path_set", "ok": ok, "path": path})
 
 def set_adb_override(path: Optional[str]):
     global _ADB_OVERRIDE
     _ADB_OVERRIDE = path
+    invalidate_adb_path()
+
+def invalidate_adb_path():
+    global _ADB_RESOLVED, _ADB_OVERRIDE_OK
+    _ADB_RESOLVED = None
+    _ADB_OVERRIDE_OK = bool(_ADB_OVERRIDE) and os.path.isfile(_ADB_OVERRIDE)
+    reset_adb_discovery_cache()
+
+def reset_adb_discovery_cache():
+    _has_adb_ok_cached.cache_clear()
+    _find_adb_in_tools_cached.cache_clear()
 
 def get_adb_override() -> Optional[str]:
     global _ADB_OVERRIDE
     return _ADB_OVERRIDE
 
-def adb_exec(args: List[str], cwd=None) -> Tuple[int, str, str]:
-    global _ADB_OVERRIDE
-    if _ADB_OVERRIDE:
-        adb_path = _ADB_OVERRIDE
-        if Path(adb_path).exists():
-            return _run_capture([adb_path] + args, cwd=cwd)
-            
-    local_tools_adb = _find_adb_in_tools()
-    if local_tools_adb and Path(local_tools_adb).exists():
+def _resolve_adb_path() -> Optional[str]:
+    global _ADB_OVERRIDE, _ADB_OVERRIDE_OK, _ADB_RESOLVED
+    if _ADB_RESOLVED:
+        return _ADB_RESOLVED
+        
+    if _ADB_OVERRIDE and _ADB_OVERRIDE_OK:
+        _ADB_RESOLVED = _ADB_OVERRIDE
+        return _ADB_RESOLVED
+        
+    local_tools_adb = _find_adb_in_tools_cached()
+    if local_tools_adb:
         _ADB_OVERRIDE = local_tools_adb
-        return _run_capture([local_tools_adb] + args, cwd=cwd)
+        _ADB_OVERRIDE_OK = True
+        _ADB_RESOLVED = local_tools_adb
+        return _ADB_RESOLVED
         
-    adb_path = _has_adb_ok()
+    _ADB_RESOLVED = _has_adb_ok_cached() or None
+    if not _ADB_RESOLVED:
+        reset_adb_discovery_cache()
+    return _ADB_RESOLVED
+
+def adb_exec(args: List[str], cwd=None) -> Tuple[int, str, str]:
+    adb_path = _resolve_adb_path()
     if not adb_path:
         return 127, "", "adb not found"
         
-    return _run_capture([adb_path] + args, cwd=cwd)
+    try:
+        code, out, err = _run_capture([adb_path] + args, cwd=cwd)
+    except OSError as e:
+        invalidate_adb_path()
+        return 127, "", f"adb not found: {e}"
+    if code == 127:
+        invalidate_adb_path()
+    elif code != 0 and args[:1] not in (["start-server"], ["kill-server"]) and _DAEMON_DOWN_RE.search(out + err):
+        _run_capture([adb_path, "start-server"])
+        code, out, err = _run_capture([adb_path] + args, cwd=cwd)
+    return code, out, err
+
+def _get_shell_session(serial: str) -> Optional[AdbShellSession]:
+    sess = _SHELL_SESSIONS.get(serial)
+    if sess and sess.alive():
+        return sess
+    close_shell_session(serial)
+    if serial not in _READY_SERIALS or serial in _SHELL_FAILED:
+        return None
+    adb_path = _resolve_adb_path()
+    if not adb_path:
+        return None
+    try:
+        sess = AdbShellSession(adb_path, serial)
+    except Exception:
+        return None
+    _SHELL_SESSIONS[serial] = sess
+    return sess
+
+def close_shell_session(serial: str):
+    sess = _SHELL_SESSIONS.pop(serial, None)
+    if sess:
+        sess.close()
+
+def close_shell_sessions():
+    for serial in list(_SHELL_SESSIONS):
+        close_shell_session(serial)
 
 def adb_shell(serial: str, args: List[str]) -> Tuple[int, str, str]:
+    sess = _get_shell_session(serial)
+    if sess:
+        try:
+            return sess.run(args)
+        except Exception:
+            _SHELL_FAILED.add(serial)
+            close_shell_session(serial)
     return adb_exec(["-s", serial, "shell"] + args)
 
 def adb_get_model_fallback(serial: str) -> str:
-    keys = [
-        "ro.product.model",
-        "ro.product.name",
-        "ro.product.device",
-    ]
-    for k in keys:
+    code, out, err = adb_shell(serial, ["getprop"])
+    props = {}
+    if code == 0:
+        for line in (out or "").splitlines():
+            m = _GETPROP_RE.match(line.strip())
+            if m:
+                props[m.group(1)] = m.group(2).strip()
+    if props:
+        for k in _MODEL_PROP_KEYS:
+            if props.get(k):
+                return props[k]
+        return ""
+    if code != 0:
+        return ""
+    for k in _MODEL_PROP_KEYS:
         code, out, err = adb_shell(serial, ["getprop", k])
         val = (out or "").strip()
         if code == 0 and val:
             return val
-    code, out, err = adb_shell(serial, ["getprop", "ro.serialno"])
-    if code == 0 and (out or "").strip():
-        return (out or "").strip()
     return ""
 
+def _emit(out_q: Queue, silent: bool, msg: str):
+    if silent:
+        out_q.put({"type": "log", "text": msg})
+    else:
+        out_q.put({"type": "fail", "error": msg})
+
 def validate_devices_ready(devs: List[Dict[str, str]], out_q: Queue, context: str) -> bool:
-    silent_contexts = {"env_check", "init"}
-    silent = context in silent_contexts
+    silent = context in _SILENT_CONTEXTS
     
-    if not _has_adb_ok():
+    if not _resolve_adb_path():
         return False
 
     if not devs:
-        msg = f"[ADB] 연결된 기기가 없습니다. ({context})"
-        if silent:
-            out_q.put({"type": "log", "text": msg})
-        else:
-            out_q.put({"type": "fail", "error": msg})
+        _emit(out_q, silent, f"[ADB] 연결된 기기가 없습니다. ({context})")
         return False
         
     bad = [d for d in devs if d.get("state") != "device"]
@@ -91,82 +249,149 @@ def validate_devices_ready(devs: List[Dict[str, str]], out_q: Queue, context: st
             ser = d.get("serial", "")
             st  = d.get("state", "")
             mdl = d.get("model", "")
-            tip = {
-                "unauthorized": "디바이스에서 USB 디버깅을 승인해 주세요.",
-                "offline": "USB 케이블/드라이버 점검 후 재연결해 주세요.",
-                "recovery": "일반 부팅 상태로 전환 후 다시 시도해 주세요.",
-                "sideload": "일반 부팅 상태로 전환 후 다시 시도해 주세요.",
-                "bootloader": "일반 부팅 상태로 전환 후 다시 시도해 주세요.",
-            }.get(st, "")
+            tip = _STATE_TIPS.get(st, "")
             lines.append(f" - {ser}  state={st} {f'({mdl})' if mdl else ''}  {tip}")
             
-        msg = "[ADB] 기기 연결 비정상\n" f"(context={context})\n" + "\n".join(lines)
-        if silent:
-            out_q.put({"type": "log", "text": msg})
-        else:
-            out_q.put({"type": "fail", "error": msg})
-        adb_exec(["kill-server"])
-        adb_start_server()
+        _emit(out_q, silent, "[ADB] 기기 연결 비정상\n" f"(context={context})\n" + "\n".join(lines))
+        if all(d.get("state") == "offline" for d in devs):
+            _restart_server()
         return False
         
     return True
 
+def _restart_server():
+    close_shell_sessions()
+    _READY_SERIALS.clear()
+    adb_exec(["kill-server"])
+    adb_exec(["start-server"])
+
 def adb_start_server(out_q: Optional[Queue]=None) -> bool:
     adb_exec(["start-server"])
-    code, out, err = adb_exec(["get-state"])
-    if code == 0 and ("device" in (out+err).lower()):
-        if out_q: out_q.put({"type":"log","text":"[ADB] server ready"})
-        return True
     devs, _ = adb_list_devices()
     ok = len(devs) > 0
+    if ok and out_q: out_q.put({"type":"log","text":"[ADB] server ready"})
     return ok
 
-def adb_list_devices() -> Tuple[List[Dict[str,str]], str]:
-    code, out, err = adb_exec(["devices", "-l"])
-    raw = (out or "") + (("\n"+err) if err else "")
-    devices = []
-    valid_states = {"device","unauthorized","offline","recovery","sideload","bootloader"}
+def _device_attr(rest: str, key: str) -> str:
+    idx = rest.find(" " + key)
+    if idx < 0:
+        return ""
+    start = idx + 1 + len(key)
+    end = rest.find(" ", start)
+    return rest[start:end if end >= 0 else None]
+
+def _parse_device_line(line: str) -> Optional[Tuple[Dict[str,str], str, str]]:
+    parts = line.split(None, 2)
+    if len(parts) < 2 or parts[1] not in _VALID_STATES:
+        return None
+    rest = " " + parts[2] if len(parts) > 2 else ""
+    dev = {"serial":parts[0], "model":_device_attr(rest, "model:"), "state":parts[1]}
+    return dev, _device_attr(rest, "product:"), _device_attr(rest, "device:")
+
+def _parse_devices(raw: str) -> Tuple[List[Dict[str,str]], List[Dict[str,str]]]:
+    lines = (line.strip() for line in raw.splitlines())
+    candidates = (line for line in lines if line and not line.startswith(("List of devices", "*")) and not line.lower().startswith("adb "))
+    parsed = [p for p in map(_parse_device_line, candidates) if p]
     
-    for line in raw.splitlines():
-        line = line.strip()
-        if (not line) or line.startswith("List of devices"):
-            continue
-        if line.lower().startswith("adb "):
-            continue
-            
-        parts = line.split()
-        if len(parts) < 2:
-            continue
-            
-        serial = parts[0].strip()
-        state  = parts[1].strip()
-        if state not in valid_states:
-            continue
-        if serial.lower() == "adb":
-            continue
-            
-        model = ""
-        product = ""
-        devname = ""
-        
-        for token in parts[2:]:
-            if token.startswith("model:"):
-                model = token.split(":",1)[1]
-            elif token.startswith("product:"):
-                product = token.split(":",1)[1]
-            elif token.startswith("device:"):
-                devname = token.split(":",1)[1]
+    needs_model = []
+    for dev, product, devname in parsed:
+        if not dev["model"]:
+            dev["model"] = product or devname
+        if not dev["model"] and dev["state"] == "device":
+            cached = _MODEL_CACHE.get(dev["serial"])
+            if cached is None:
+                needs_model.append(dev)
+            else:
+                dev["model"] = cached
                 
-        if not model:
-            maybe = adb_get_model_fallback(serial)
-            model = maybe or product or devname
-            
-        devices.append({"serial":serial, "model":model, "state":state})
+    return [dev for dev, _, _ in parsed], needs_model
+
+def _begin_listing(devices: List[Dict[str,str]]):
+    _READY_SERIALS.clear()
+    _READY_SERIALS.update(d["serial"] for d in devices if d["state"] == "device")
+    _SHELL_FAILED.clear()
+
+def _finish_devices(devices: List[Dict[str,str]], needs_model: List[Dict[str,str]], models: List[str]):
+    for dev, maybe in zip(needs_model, models):
+        if dev["state"] == "device" and maybe:
+            _MODEL_CACHE[dev["serial"]] = maybe
+        dev["model"] = maybe
         
+    seen = {d["serial"] for d in devices if d["state"] == "device"}
+    for ser in [s for s in _MODEL_CACHE if s not in seen]:
+        _MODEL_CACHE.pop(ser, None)
+    for ser in [s for s in _SHELL_SESSIONS if s not in seen]:
+        close_shell_session(ser)
+
+def _model_pool() -> ThreadPoolExecutor:
+    global _MODEL_POOL
+    if _MODEL_POOL is None:
+        _MODEL_POOL = ThreadPoolExecutor(max_workers=8)
+    return _MODEL_POOL
+
+def adb_list_devices() -> Tuple[List[Dict[str,str]], str]:
+    code, out, err = adb_exec(["devices", "-l"])
+    raw = (out or "") + (("\n"+err) if err else "")
+    devices, needs_model = _parse_devices(raw)
+    _begin_listing(devices)
+    if len(needs_model) == 1:
+        models = [adb_get_model_fallback(needs_model[0]["serial"])]
+    else:
+        models = list(_model_pool().map(adb_get_model_fallback, [dev["serial"] for dev in needs_model]))
+    _finish_devices(devices, needs_model, models)
     return devices, raw
 
+def adb_install_many(apks: List[Path], serial: Optional[str], out_q: Queue) -> Tuple[int, str, str]:
+    verb = "install" if len(apks) == 1 else "install-multiple"
+    args = [verb, "-r"] + [str(p) for p in apks]
+    if serial:
+        args = ["-s", serial] + args
+    adb_path = _resolve_adb_path()
+    if not adb_path:
+        return 127, "", "adb not found"
+    try:
+        return _run_stream([adb_path] + args, out_q, tag="ADB")
+    except OSError as e:
+        invalidate_adb_path()
+        return 127, "", f"adb not found: {e}"
+
 def adb_install(apk_path: Path, serial: Optional[str], out_q: Queue) -> Tuple[int, str, str]:
-    base = ["install", "-r", str(apk_path)]
+    return adb_install_many([apk_path], serial, out_q)
+
+def _adaptive_poll_times(budget_k: int, U_seconds: float) -> List[float]:
+    if _READY_SAMPLES:
+        mean = max(0.05, sum(_READY_SAMPLES) / len(_READY_SAMPLES))
+    else:
+        mean = U_seconds / 4
+    cdf_u = 1.0 - math.exp(-U_seconds / mean)
+    return [-mean * math.log(1.0 - cdf_u * i / budget_k) for i in range(1, budget_k + 1)]
+
+def _devices_ready(devs: List[Dict[str,str]], serial: Optional[str]) -> bool:
     if serial:
-        return adb_exec(["-s", serial] + base)
-    return adb_exec(base)
\ No newline at end of file
+        return any(d.get("serial") == serial and d.get("state") == "device" for d in devs)
+    return bool(devs) and all(d.get("state") == "device" for d in devs)
+
+def poll_devices_adaptive(out_q: Queue, serial: Optional[str] = None, budget_k: int = 8, U_seconds: float = 30.0) -> Tuple[List[Dict[str,str]], str]:
+    start = time.monotonic()
+    devs, raw = adb_list_devices()
+    if not devs or _devices_ready(devs, serial):
+        return devs, raw
+    out_q.put({"type":"log","text":"[ADB] 기기 준비 대기중... (USB 디버깅 승인/재연결 확인)"})
+    for t in _adaptive_poll_times(budget_k, U_seconds):
+        time.sleep(max(0.0, start + t - time.monotonic()))
+        devs, raw = adb_list_devices()
+        if _devices_ready(devs, serial):
+            _READY_SAMPLES.append(time.monotonic() - start)
+            return devs, raw
+        remain = start + U_seconds - time.monotonic()
+        if remain >= 1.0: out_q.put({"type":"log","text":f"[ADB] 기기 준비 대기중... 남은 시간 {remain:.0f}초"})
+    _READY_SAMPLES.append(time.monotonic() - start)
+    return devs, raw
+    out_q.put({"type":"log","text":"[ADB] 기기 준비 대기중... (USB 디버깅 승인/재연결 확인)"})
+    for t in _adaptive_poll_times(budget_k, U_seconds):
+        time.sleep(max(0.0, start + t - time.monotonic()))
+        devs, raw = adb_list_devices()
+        if devs and all(d.get("state") == "device" for d in devs):
+            _READY_SAMPLES.append(time.monotonic() - start)
+            return devs, raw
+    return devs, raw
@@ -1,19 +1,154 @@
-import re, queue
+import json, queue, threading
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Union
+from typing import List, Dict, Tuple, Optional, Union, FrozenSet
 from multiprocessing import Queue
 
 from PySide6.QtWidgets import (
     QWidget, QFileDialog, QVBoxLayout, QHBoxLayout, QLabel,
-    QLineEdit, QPushButton, QTextEdit, QCheckBox, QProgressBar, QMessageBox,
+    QLineEdit, QPushButton, QPlainTextEdit, QCheckBox, QProgressBar, QMessageBox,
     QListWidget, QListWidgetItem, QSplitter, QGroupBox, QFormLayout,
-    QHeaderView, QDialog, QDialogButtonBox, QTableWidget, QTableWidgetItem,
+    QHeaderView, QDialog, QDialogButtonBox, QTableView,
     QAbstractItemView, QSizePolicy, QTabWidget, QComboBox, QScrollArea
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QObject, Signal, QAbstractTableModel, QSortFilterProxyModel, QModelIndex, QSignalBlocker
 from PySide6.QtGui import QTextCursor
 
-from utils import _ensure_dir, _clear_form_layout, _try_extract_package_from_apk, _dir_is_empty, CLI_RELEASE_URL, PATCHES_RELEASE_URL
+from utils import _ensure_dir, _try_extract_package_from_apk, _dir_is_empty, fetch_pretendard_font, CLI_RELEASE_URL, PATCHES_RELEASE_URL
+
+_IDX_ROLE = Qt.UserRole
+_NAME_ROLE = Qt.UserRole + 1
+_CUSTOM_OPTION_TEXT = "직접 입력..."
+_EMPTY_FROZENSET: FrozenSet[str] = frozenset()
+_MISSING = object()
+_DRAIN_MAX_PER_TICK = 500
+
+def _option_arg(key: str, value: Optional[str]) -> str:
+    return f"-O{key}" if value in (None, "") else f"-O{key}={value}"
+
+class PatchModel(QAbstractTableModel):
+    HEADERS = ["사용","Index","Name","Packages"]
+    FETCH_BATCH = 200
+
+    def __init__(self, entries, parent=None):
+        super().__init__(parent)
+        self._entries = entries
+        self._fetched = min(self.FETCH_BATCH, len(entries))
+        self._enabled = bytearray(1 if e.get("enabled") else 0 for e in entries)
+        self._search_blob = [
+            "\x1f".join([e.get("name","").lower()] + [p.lower() for p in e.get("packages",[])])
+            for e in entries
+        ]
+        self._pkgs_str = [e["_pkgs_str"] if "_pkgs_str" in e else ", ".join(e.get("packages",[])) for e in entries]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._fetched
+
+    def total_rows(self) -> int:
+        return len(self._entries)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetched < len(self._entries)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self._fetch_to(min(self._fetched + self.FETCH_BATCH, len(self._entries)))
+
+    def fetch_all(self):
+        self._fetch_to(len(self._entries))
+
+    def _fetch_to(self, end: int):
+        if end <= self._fetched:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, end - 1)
+        self._fetched = end
+        self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        e = self._entries[index.row()]
+        col = index.column()
+        if col == 0 and role == Qt.CheckStateRole:
+            return Qt.Checked if self._enabled[index.row()] else Qt.Unchecked
+        if role == Qt.DisplayRole:
+            if col == 1: return str(e.get("index"))
+            if col == 2: return e.get("name","")
+            if col == 3: return self._pkgs_str[index.row()]
+        return None
+
+    def flags(self, index):
+        f = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            f |= Qt.ItemIsUserCheckable
+        return f
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() != 0 or role != Qt.CheckStateRole:
+            return False
+        self._enabled[index.row()] = Qt.CheckState(value) == Qt.Checked
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def set_enabled_rows(self, rows: List[int], enabled: bool):
+        if not rows:
+            return
+        if len(rows) == len(self._enabled):
+            self._enabled[:] = (b"\x01" if enabled else b"\x00") * len(self._enabled)
+        else:
+            flag = 1 if enabled else 0
+            for r in rows:
+                self._enabled[r] = flag
+        first, last = min(rows), min(max(rows), self._fetched - 1)
+        if first <= last:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, 0), [Qt.CheckStateRole])
+
+    def enabled_entries(self) -> List[dict]:
+        return [e for e, on in zip(self._entries, self._enabled) if on]
+
+    def commit_enabled(self):
+        for e, on in zip(self._entries, self._enabled):
+            e["enabled"] = bool(on)
+
+    def matches(self, row: int, q: str) -> bool:
+        return q in self._search_blob[row]
+
+class PatchFilterProxy(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._query = ""
+        self._accepted: Optional[set] = None
+
+    def set_query(self, q: str):
+        src = self.sourceModel()
+        if not q:
+            accepted = None
+        else:
+            src.fetch_all()
+            if self._accepted is not None and q.startswith(self._query):
+                candidates = self._accepted
+            else:
+                candidates = range(src.rowCount())
+            accepted = {r for r in candidates if src.matches(r, q)}
+        self._query = q
+        self._accepted = accepted
+        self.invalidateFilter()
+
+    def accepted_rows(self) -> List[int]:
+        if self._accepted is None:
+            return list(range(self.sourceModel().total_rows()))
+        return sorted(self._accepted)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self._accepted is None or source_row in self._accepted
 
 class PatchPickerDialog(QDialog):
     def __init__(self, entries, parent=None):
@@ -28,75 +163,89 @@ class PatchPickerDialog(QDialog):
         btn_unselect = QPushButton("전체 해제")
         top.addWidget(self.search); top.addWidget(btn_sel_all); top.addWidget(btn_unselect)
         lay.addLayout(top)
-        self.table = QTableWidget(self)
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["사용","Index","Name","Packages"])
+        self._all_rows = list(self.entries)
+        self.model = PatchModel(self._all_rows, self)
+        self.proxy = PatchFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = QTableView(self)
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.table.horizontalHeader().setResizeContentsPrecision(200)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setAlternatingRowColors(True)
         lay.addWidget(self.table)
         btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, parent=self)
         lay.addWidget(btns)
-        self._all_rows = list(self.entries)
-        self._rebuild(self._all_rows)
-        self.search.textChanged.connect(self._apply_filter)
+        self._last_query = ""
+        self._search_timer = QTimer(self); self._search_timer.setSingleShot(True); self._search_timer.setInterval(180)
+        self._search_timer.timeout.connect(self._apply_filter_now)
+        self.search.textChanged.connect(self._search_timer.start)
         btn_sel_all.clicked.connect(self._select_all)
         btn_unselect.clicked.connect(self._unselect_all)
         btns.accepted.connect(self.accept)
         btns.rejected.connect(self.reject)
 
-    def _rebuild(self, rows):
-        self.table.setRowCount(0)
-        for e in rows:
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-            chk = QCheckBox()
-            chk.setChecked(bool(e.get("enabled")))
-            chk.stateChanged.connect(lambda s, entry=e: entry.__setitem__("enabled", s == Qt.Checked))
-            cell = QWidget(); h = QHBoxLayout(cell); h.setContentsMargins(4,0,0,0); h.addWidget(chk); h.addStretch()
-            self.table.setCellWidget(r, 0, cell)
-            it_idx = QTableWidgetItem(str(e.get("index"))); it_name = QTableWidgetItem(e.get("name","")); it_pkgs = QTableWidgetItem(", ".join(e.get("packages",[])))
-            self.table.setItem(r,1,it_idx); self.table.setItem(r,2,it_name); self.table.setItem(r,3,it_pkgs)
-
-    def _apply_filter(self):
+    def _apply_filter_now(self):
         q = self.search.text().strip().lower()
-        if not q:
-            self._rebuild(self._all_rows); return
-        rows=[]
-        for e in self._all_rows:
-            if q in e.get("name","").lower() or any(q in p.lower() for p in e.get("packages",[])):
-                rows.append(e)
-        self._rebuild(rows)
-
-    def _iter_checkboxes(self):
-        for r in range(self.table.rowCount()):
-            cell = self.table.cellWidget(r,0)
-            chk = cell.findChild(QCheckBox)
-            yield r, chk
+        if q == self._last_query:
+            return
+        self._last_query = q
+        self.proxy.set_query(q)
 
     def _select_all(self):
-        for _, chk in self._iter_checkboxes():
-            chk.setChecked(True)
+        self.model.set_enabled_rows(self.proxy.accepted_rows(), True)
 
     def _unselect_all(self):
-        for _, chk in self._iter_checkboxes():
-            chk.setChecked(False)
+        self.model.set_enabled_rows(self.proxy.accepted_rows(), False)
+
+    def accept(self):
+        self.model.commit_enabled()
+        super().accept()
 
     def get_enabled(self) -> Tuple[List[int], List[str]]:
         idxs, names = [], []
-        for r, chk in self._iter_checkboxes():
-            if chk.isChecked():
-                idx_item = self.table.item(r,1)
-                name_item = self.table.item(r,2)
-                try: idxs.append(int(idx_item.text()))
-                except: pass
-                names.append(name_item.text())
+        for e in self.model.enabled_entries():
+            try: idxs.append(int(e.get("index")))
+            except: pass
+            names.append(e.get("name",""))
         return idxs, names
 
+class QueueReader(QObject):
+    ready = Signal()
+
+    def __init__(self, src: Queue, parent=None):
+        super().__init__(parent)
+        self.inbox: "queue.SimpleQueue[dict]" = queue.SimpleQueue()
+        self.pending = threading.Event()
+        self._src = src
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                m = self._src.get()
+            except (EOFError, OSError):
+                return
+            self.inbox.put(m)
+            if not self.pending.is_set():
+                self.pending.set()
+                self.ready.emit()
+
+class FontLoader(QObject):
+    ready = Signal()
+
+    def start(self, font_dir: Path):
+        threading.Thread(target=self._run, args=(font_dir,), daemon=True).start()
+
+    def _run(self, font_dir: Path):
+        if fetch_pretendard_font(font_dir):
+            self.ready.emit()
+
 class App(QWidget):
     def __init__(self, q_in: Queue, q_out: Queue):
         super().__init__()
@@ -114,19 +263,28 @@ class App(QWidget):
         self._qout = q_out
         
         self.entries = []
+        self._items: Optional[List[QListWidgetItem]] = None
+        self._pkgs_map: Dict[Union[int, str], FrozenSet[str]] = {}
+        self._idx_opts: Dict[int, List[str]] = {}
+        self._change_pkg_idx: set = set()
         self._keep_idx = set()
         self._keep_name = set()
         self.reset_select = True
         self.dynamic_option_widgets: Dict[str, QWidget] = {}
+        self._option_widget_pool: Dict[str, Tuple[QLabel, QWidget]] = {}
         self._auto_list_after_download = False
+        self._last_sent_adb_path: Optional[str] = None
+        self._dl_progress: Dict[str, Tuple[int, int]] = {}
+        self._detected_pkg = ""
         
         self._create_widgets()
         self._create_layouts()
         self._connect_signals()
         
-        self._drain_timer = QTimer(self); self._drain_timer.setInterval(50)
-        self._drain_timer.timeout.connect(self._drain_queues)
-        self._drain_timer.start()
+        self._reader = QueueReader(self._qout, self)
+        self._reader.ready.connect(self._drain_queues, Qt.QueuedConnection)
+        self._options_timer = QTimer(self); self._options_timer.setSingleShot(True); self._options_timer.setInterval(50)
+        self._options_timer.timeout.connect(self._update_dynamic_options)
         
         QTimer.singleShot(0, self.on_env_check)
 
@@ -146,7 +304,8 @@ class App(QWidget):
         self.progress.setFormat("%p%")
         self.progress.setRange(0, 1); self.progress.setValue(0)
         
-        self.log = QTextEdit(); self.log.setReadOnly(True)
+        self.log = QPlainTextEdit(); self.log.setReadOnly(True)
+        self.log.setMaximumBlockCount(5000)
 
     def _create_setup_tab(self) -> QWidget:
         tab = QWidget()
@@ -324,14 +483,14 @@ class App(QWidget):
         self.btn_apk.clicked.connect(self.pick_apk)
         
         self.include_universal.checkStateChanged.connect(lambda: self.on_list_patches() if self.cli_jar and self.rvp_file else None)
-        self.btn_list.clicked.connect(self.on_list_patches)
+        self.btn_list.clicked.connect(lambda: self.on_list_patches(force_refresh=True))
         self.btn_picker.clicked.connect(self.open_patch_picker)
         self.btn_export.clicked.connect(self.export_selection)
         self.btn_import.clicked.connect(self.import_selection)
         self.btn_preset_clone.clicked.connect(self.apply_preset)
         self.btn_ks.clicked.connect(self.pick_keystore)
         self.btn_tmp.clicked.connect(self.pick_tmp_dir)
-        self.list_widget.itemChanged.connect(self._update_dynamic_options)
+        self.list_widget.itemChanged.connect(self._schedule_dynamic_options)
         self.btn_build.clicked.connect(self.on_build)
         
         self.btn_adb_browse.clicked.connect(self.pick_adb_path)
@@ -359,9 +518,12 @@ class App(QWidget):
 
     def _drain_queues(self):
         drained = False
-        while True:
+        log_lines: List[str] = []
+        self._reader.pending.clear()
+        inbox = self._reader.inbox
+        for _ in range(_DRAIN_MAX_PER_TICK):
             try:
-                m = self._qout.get_nowait()
+                m = inbox.get_nowait()
             except queue.Empty:
                 break
                 
@@ -369,15 +531,25 @@ class App(QWidget):
             t = m.get("type")
             
             if t == "log":
-                self.log.append(m.get("text",""))
-            elif t == "fail":
+                log_lines.append(m.get("text",""))
+                continue
+            if t == "log_batch":
+                log_lines.extend(m.get("lines") or [])
+                continue
+            if log_lines:
+                self.log.appendPlainText("\n".join(log_lines))
+                log_lines.clear()
+            if t == "fail":
                 QMessageBox.warning(self, "실패", m.get("error","오류"))
                 self._pb_idle()
             elif t == "done":
                 self._pb_idle()
             elif t == "progress":
                 if m.get("phase") == "download":
-                    self._pb_set(int(m.get("value", 0)))
+                    self._dl_progress[m.get("target")] = (m.get("done", 0), m.get("total", 0))
+                    done = sum(d for d, _ in self._dl_progress.values())
+                    total = sum(t for _, t in self._dl_progress.values())
+                    self._pb_set(int(done * 100 / total) if total else int(m.get("value", 0)))
             elif t == "env":
                 java_ok = m.get("java_ok"); jline = (m.get("java_out","").splitlines()[0] if m.get("java_out") else "")
                 self.java_status.setText(f"Java: {'OK' if java_ok else '미설치/버전 불가'} ({jline})")
@@ -385,6 +557,7 @@ class App(QWidget):
                 self.adb_status_env.setText(f"ADB: {'OK' if adb_ok else '없음'}")
                 self.adb_status.setText(f"ADB: {'OK' if adb_ok else '없음'}")
             elif t == "download_ok":
+                self._dl_progress.clear()
                 self.cli_jar = Path(m["cli"]); self.rvp_file = Path(m["rvp"])
                 self.cli_path_lbl.setText(f"CLI: {self.cli_jar.name}")
                 self.rvp_path_lbl.setText(f"패치 번들: {self.rvp_file.name}")
@@ -394,52 +567,57 @@ class App(QWidget):
                         self.reset_select = True
                         QTimer.singleShot(0, self.on_list_patches)
             elif t == "patches":
-                self.entries = m.get("entries",[])
+                raw_entries = m.get("entries_json")
+                self.entries = json.loads(raw_entries) if raw_entries else m.get("entries",[])
+                self._index_entries()
+                self.list_widget.setUpdatesEnabled(False)
+                patches_to_check = set(self._patches_to_check_on_load)
+                blocker = QSignalBlocker(self.list_widget)
                 try:
-                    self.list_widget.itemChanged.disconnect(self._update_dynamic_options)
-                except RuntimeError:
-                    pass
-                self.list_widget.clear()
-                for e in self.entries:
-                    if e.get('index') is None: continue
-                    label = f"[{e.get('index')}] {e.get('name','')}"
-                    pkgs = e.get("packages",[])
-                    if pkgs:
-                        label += f"  ({', '.join(pkgs)})"
-                    item = QListWidgetItem(label)
-                    if self.reset_select:
-                        keep = bool(e.get("enabled"))
-                    else:
-                        keep = (e.get('index') in self._keep_idx) or (e.get('name') in self._keep_name)
-                    item.setCheckState(Qt.Checked if keep else Qt.Unchecked)
-                    self.list_widget.addItem(item)
+                    self.list_widget.clear()
+                    self._items = []
+                    for e in self.entries:
+                        if e.get('index') is None: continue
+                        label = f"[{e.get('index')}] {e.get('name','')}"
+                        e["_pkgs_str"] = pkgs_str = ", ".join(e.get("packages",[]))
+                        if pkgs_str:
+                            label += f"  ({pkgs_str})"
+                        item = QListWidgetItem(label)
+                        item.setData(_IDX_ROLE, e['index'])
+                        item.setData(_NAME_ROLE, e.get('name',''))
+                        if self.reset_select:
+                            keep = bool(e.get("enabled"))
+                        else:
+                            keep = (e.get('index') in self._keep_idx) or (e.get('name') in self._keep_name)
+                        if e.get('name') in patches_to_check:
+                            keep = True
+                        item.setCheckState(Qt.Checked if keep else Qt.Unchecked)
+                        self.list_widget.addItem(item)
+                        self._items.append(item)
+                finally:
+                    blocker.unblock()
+                    self.list_widget.setUpdatesEnabled(True)
                 self.reset_select = False
-                self.list_widget.itemChanged.connect(self._update_dynamic_options)
+                self._patches_to_check_on_load = []
+                self._reset_option_pool()
                 self._update_dynamic_options()
-                self.log.append(f"[OK] 패치 목록 불러오기 완료: {self.pkg_edit.text() or 'APK 미지정'}")
-                if getattr(self, "_patches_to_check_on_load", []):
-                    patches_to_check = set(self._patches_to_check_on_load)
-                    for i in range(self.list_widget.count()):
-                        item = self.list_widget.item(i)
-                        item_name = self._extract_item_name(item.text())
-                        if item_name in patches_to_check:
-                            item.setCheckState(Qt.Checked)
-                    self._patches_to_check_on_load = []
+                self.log.appendPlainText(f"[OK] 패치 목록 불러오기 완료: {self.pkg_edit.text() or 'APK 미지정'}")
             elif t == "pkg":
                 val = m.get("value")
                 if val:
+                    self._detected_pkg = val
                     self.pkg_edit.setText(val)
             elif t == "build_begin":
                 self._pb_busy()
             elif t == "build_end":
                 self._pb_idle()
             elif t == "build_ok":
-                self.log.append(f"[DONE] 빌드 완료 → {m.get('apk')}")
+                self.log.appendPlainText(f"[DONE] 빌드 완료 → {m.get('apk')}")
                 if self.adb_install_check.isChecked():
                     serial_text = (self.adb_device_edit.text() or "").strip()
                     serial = serial_text.split()[0] if serial_text else ""
                     self._pb_busy()
-                    self.log.append(f"[ADB] 설치 시작 (serial={serial or 'auto'})")
+                    self.log.appendPlainText(f"[ADB] 설치 시작 (serial={serial or 'auto'})")
                     self._qin.put({"cmd":"adb_install_apk","serial":serial,"apk":m.get('apk')})
                 else:
                     self._pb_idle()
@@ -449,26 +627,30 @@ class App(QWidget):
                     ser = devs[0].get("serial",""); mdl = devs[0].get("model","")
                     shown = f"{ser}" + (f"  ({mdl})" if mdl else "")
                     self.adb_device_edit.setText(shown)
-                    self.log.append(f"[ADB] 1대 연결됨: {shown}")
+                    self.log.appendPlainText(f"[ADB] 1대 연결됨: {shown}")
                 elif len(devs) > 1:
                     sers = [ (d.get("serial","") + (f'({d.get("model","")})' if d.get("model") else "")) for d in devs ]
-                    self.log.append(f"[ADB] 여러 대 연결됨:\n  - " + "\n  - ".join(sers))
+                    self.log.appendPlainText(f"[ADB] 여러 대 연결됨:\n  - " + "\n  - ".join(sers))
                     if not self.adb_device_edit.text().strip():
                         d0 = devs[0]
                         shown = d0.get("serial","") + (f"  ({d0.get('model','')})" if d0.get("model") else "")
                         self.adb_device_edit.setText(shown)
                 else:
-                    self.log.append("[ADB] 연결된 디바이스 없음")
+                    self.log.appendPlainText("[ADB] 연결된 디바이스 없음")
             elif t == "adb_install_ok":
                 apk = m.get("apk"); ser = m.get("serial","")
-                self.log.append(f"[ADB] 설치 완료: {apk} → {ser or 'single-device'}")
+                self.log.appendPlainText(f"[ADB] 설치 완료: {apk} → {ser or 'single-device'}")
                 self._pb_idle()
             elif t == "adb_path_set":
                 ok = m.get("ok"); p = m.get("path") or ""
                 if p:
                     self.adb_path_edit.setText(p)
-                    self.log.append(f"[SET] ADB 경로: {p} ({'확인' if ok else '미확인'})")
-                    
+                    self.log.appendPlainText(f"[SET] ADB 경로: {p} ({'확인' if ok else '미확인'})")
+        else:
+            QTimer.singleShot(0, self._drain_queues)
+
+        if log_lines:
+            self.log.appendPlainText("\n".join(log_lines))
         if drained:
             self.log.moveCursor(QTextCursor.End)
             self.log.ensureCursorVisible()
@@ -476,27 +658,38 @@ class App(QWidget):
     def _remember_selection(self):
         self._keep_idx.clear()
         self._keep_name.clear()
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
+        for item in self._items_snapshot():
             if item.checkState() == Qt.Checked:
-                m = re.match(r'^\[(\d+)\]\s+(.*)$', item.text())
-                if m and m.group(1).isdigit():
-                    self._keep_idx.add(int(m.group(1)))
-                    self._keep_name.add(self._extract_item_name(item.text()))
-                else:
-                    self._keep_name.add(self._extract_item_name(item.text()))
+                self._keep_idx.add(item.data(_IDX_ROLE))
+                self._keep_name.add(item.data(_NAME_ROLE))
 
-    def _update_dynamic_options(self, item: Optional[QListWidgetItem] = None):
-        _clear_form_layout(self.dynamic_options_layout)
+    def _schedule_dynamic_options(self, item: Optional[QListWidgetItem] = None):
+        self._options_timer.start()
+
+    def _reset_option_pool(self):
+        layout = self.dynamic_options_layout
+        while layout.rowCount():
+            layout.takeRow(0)
+        for label, widget in self._option_widget_pool.values():
+            label.deleteLater()
+            widget.deleteLater()
+        self._option_widget_pool.clear()
         self.dynamic_option_widgets.clear()
+
+    def _update_dynamic_options(self, item: Optional[QListWidgetItem] = None):
+        self._options_timer.stop()
         selected_patch_indices = set()
-        for i in range(self.list_widget.count()):
-            list_item = self.list_widget.item(i)
+        for list_item in self._items_snapshot():
             if list_item.checkState() == Qt.Checked:
-                match = re.match(r'^\[(\d+)\]', list_item.text())
-                if match and match.group(1).isdigit():
-                    selected_patch_indices.add(int(match.group(1)))
-        found_options = False
+                selected_patch_indices.add(list_item.data(_IDX_ROLE))
+        layout = self.dynamic_options_layout
+        self.dynamic_options_box.setUpdatesEnabled(False)
+        while layout.rowCount():
+            layout.takeRow(0)
+        for label, widget in self._option_widget_pool.values():
+            label.hide()
+            widget.hide()
+        self.dynamic_option_widgets.clear()
         for patch in self.entries:
             patch_index = patch.get("index")
             if patch_index is not None and patch_index in selected_patch_indices and "options" in patch:
@@ -504,79 +697,84 @@ class App(QWidget):
                     key = option.get('key')
                     if not key: continue
                     if key in {"packageName", "updatePermissions", "updateProviders"}: continue
-                    title = option.get('title', key)
-                    desc = option.get('description', '')
-                    default_val = option.get('default')
-                    widget = None
-                    custom_option_text = "직접 입력..."
-                    if "possible_values" in option:
-                        widget = QWidget()
-                        widget.setProperty("is_composite", True)
-                        layout = QHBoxLayout(widget)
-                        layout.setContentsMargins(0, 0, 0, 0)
-                        combo = QComboBox()
-                        items = option["possible_values"]
-                        combo.addItems(items)
-                        combo.addItem(custom_option_text)
-                        combo.setToolTip(desc)
-                        line_edit = QLineEdit()
-                        line_edit.setPlaceholderText("사용자 정의 값 입력")
-                        line_edit.setVisible(False)
-                        layout.addWidget(combo)
-                        layout.addWidget(line_edit)
-                        is_list_type = False
-                        if default_val is not None:
-                            if default_val.strip().startswith('[') and default_val.strip().endswith(']'):
-                                is_list_type = True
-                            found_idx = -1
-                            for i, item_text in enumerate(items):
-                                if item_text.strip().startswith(default_val):
-                                    found_idx = i
-                                    break
-                            if found_idx != -1:
-                                combo.setCurrentIndex(found_idx)
-                            else:
-                                combo.setCurrentText(custom_option_text)
-                                line_edit.setText(default_val)
-                                line_edit.setVisible(True)
-                        line_edit.setProperty("is_list_type", is_list_type)
-                        combo.currentTextChanged.connect(
-                            lambda text, le=line_edit, custom_text=custom_option_text: le.setVisible(text == custom_text)
-                        )
-                        widget.setProperty("combo_widget", combo)
-                        widget.setProperty("line_edit_widget", line_edit)
-                    else:
-                        widget = QLineEdit()
-                        widget.setProperty("is_composite", False)
-                        widget.setPlaceholderText(desc)
-                        if default_val is not None:
-                            widget.setText(default_val)
-                            if default_val.strip().startswith('[') and default_val.strip().endswith(']'):
-                                widget.setProperty("is_list_type", True)
-                            else:
-                                widget.setProperty("is_list_type", False)
-                        else:
-                            widget.setPlaceholderText(desc)
-                            widget.setProperty("is_list_type", False)
-                    if widget:
-                        label = title
-                        self.dynamic_options_layout.addRow(label, widget)
-                        widget_key = f"{patch_index}_{key}"
-                        self.dynamic_option_widgets[widget_key] = widget
-                        found_options = True
-        self.dynamic_options_scroll_area.setVisible(found_options)
+                    widget_key = f"{patch_index}_{key}"
+                    pooled = self._option_widget_pool.get(widget_key)
+                    if pooled is None:
+                        pooled = (QLabel(option.get('title', key)), self._create_option_widget(option))
+                        self._option_widget_pool[widget_key] = pooled
+                    label, widget = pooled
+                    layout.addRow(label, widget)
+                    label.show()
+                    widget.show()
+                    self.dynamic_option_widgets[widget_key] = widget
+        self.dynamic_options_box.setUpdatesEnabled(True)
+        self.dynamic_options_scroll_area.setVisible(bool(self.dynamic_option_widgets))
 
     @staticmethod
-    def _extract_item_name(item_text: str) -> str:
-        txt = re.sub(r'^\s*\[\d+\]\s*', '', item_text).strip()
-        m = re.match(r'(.+?)(\s*\(.*\))?$', txt)
-        return (m.group(1).strip() if m else txt)
+    def _create_option_widget(option: dict) -> QWidget:
+        desc = option.get('description', '')
+        default_val = option.get('default')
+        if "possible_values" in option:
+            widget = QWidget()
+            widget.setProperty("is_composite", True)
+            layout = QHBoxLayout(widget)
+            layout.setContentsMargins(0, 0, 0, 0)
+            combo = QComboBox()
+            items = option["possible_values"]
+            combo.addItems(items)
+            combo.addItem(_CUSTOM_OPTION_TEXT)
+            combo.setToolTip(desc)
+            line_edit = QLineEdit()
+            line_edit.setPlaceholderText("사용자 정의 값 입력")
+            line_edit.setVisible(False)
+            layout.addWidget(combo)
+            layout.addWidget(line_edit)
+            is_list_type = False
+            if default_val is not None:
+                if default_val.strip().startswith('[') and default_val.strip().endswith(']'):
+                    is_list_type = True
+                found_idx = -1
+                for i, item_text in enumerate(items):
+                    if item_text.strip().startswith(default_val):
+                        found_idx = i
+                        break
+                if found_idx != -1:
+                    combo.setCurrentIndex(found_idx)
+                else:
+                    combo.setCurrentText(_CUSTOM_OPTION_TEXT)
+                    line_edit.setText(default_val)
+                    line_edit.setVisible(True)
+            line_edit.setProperty("is_list_type", is_list_type)
+            combo.currentTextChanged.connect(
+                lambda text, le=line_edit: le.setVisible(text == _CUSTOM_OPTION_TEXT)
+            )
+            widget.setProperty("combo_widget", combo)
+            widget.setProperty("line_edit_widget", line_edit)
+        else:
+            widget = QLineEdit()
+            widget.setProperty("is_composite", False)
+            widget.setPlaceholderText(desc)
+            if default_val is not None:
+                widget.setText(default_val)
+                if default_val.strip().startswith('[') and default_val.strip().endswith(']'):
+                    widget.setProperty("is_list_type", True)
+                else:
+                    widget.setProperty("is_list_type", False)
+            else:
+                widget.setPlaceholderText(desc)
+                widget.setProperty("is_list_type", False)
+        return widget
 
-    def on_env_check(self):
+    def _sync_adb_path(self) -> List[dict]:
         path = (self.adb_path_edit.text() or "").strip()
-        self._qin.put({"cmd":"set_adb_path","path":path})
+        if path == self._last_sent_adb_path:
+            return []
+        self._last_sent_adb_path = path
+        return [{"cmd":"set_adb_path","path":path}]
+
+    def on_env_check(self):
         self._pb_busy()
-        self._qin.put({"cmd":"env_check"})
+        self._qin.put({"cmd":"batch","ops":self._sync_adb_path() + [{"cmd":"env_check","force":True}]})
 
     def on_java_install(self):
         self._pb_busy()
@@ -587,22 +785,19 @@ class App(QWidget):
         self._qin.put({"cmd":"install_git"})
 
     def on_adb_install(self):
-        path = (self.adb_path_edit.text() or "").strip()
-        self._qin.put({"cmd":"set_adb_path","path":path})
         self._pb_busy()
-        self.log.append("[RUN] ADB 설치 시작")
-        self._qin.put({"cmd":"install_adb"})
+        self.log.appendPlainText("[RUN] ADB 설치 시작")
+        self._qin.put({"cmd":"batch","ops":self._sync_adb_path() + [{"cmd":"install_adb"}]})
 
     def on_adb_refresh(self):
-        path = (self.adb_path_edit.text() or "").strip()
-        self._qin.put({"cmd":"set_adb_path","path":path})
         self._pb_busy()
-        self._qin.put({"cmd":"adb_devices"})
+        self._qin.put({"cmd":"batch","ops":self._sync_adb_path() + [{"cmd":"adb_devices"}]})
 
     def pick_apk(self):
         path, _ = QFileDialog.getOpenFileName(self, "APK 선택", "", "APK (*.apk)")
         if not path: return
         self.apk_edit.setText(path)
+        self._detected_pkg = ""
         self.change_pkg_input.setPlaceholderText('패키지명을 변경하려면 "Change package name" 패치 활성화 필요')
         self._pb_busy()
         self._qin.put({"cmd":"detect_package","apk":path})
@@ -612,7 +807,7 @@ class App(QWidget):
         if not path: return
         self.cli_jar = Path(path)
         self.cli_path_lbl.setText(f"CLI: {self.cli_jar.name}")
-        self.log.append(f"[OK] CLI 파일 선택됨: {path}")
+        self.log.appendPlainText(f"[OK] CLI 파일 선택됨: {path}")
         if self.cli_jar and self.rvp_file and self.pkg_edit.text():
             self.reset_select = True
             QTimer.singleShot(0, self.on_list_patches)
@@ -622,7 +817,7 @@ class App(QWidget):
         if not path: return
         self.rvp_file = Path(path)
         self.rvp_path_lbl.setText(f"패치 번들: {self.rvp_file.name}")
-        self.log.append(f"[OK] RVP 파일 선택됨: {path}")
+        self.log.appendPlainText(f"[OK] RVP 파일 선택됨: {path}")
         if self.cli_jar and self.rvp_file and self.pkg_edit.text():
             self.reset_select = True
             QTimer.singleShot(0, self.on_list_patches)
@@ -638,11 +833,11 @@ class App(QWidget):
         if path:
             self.adb_path_edit.setText(path)
             self._pb_busy()
-            self._qin.put({"cmd": "set_adb_path", "path": path})
-            self._qin.put({"cmd": "adb_devices_silent"})
+            self._qin.put({"cmd": "batch", "ops": self._sync_adb_path() + [{"cmd": "adb_devices_silent"}]})
 
     def on_download(self):
         self._pb_busy()
+        self._dl_progress.clear()
         self._auto_list_after_download = True
         self._qin.put({
             "cmd":"download_components",
@@ -653,34 +848,78 @@ class App(QWidget):
             "rvp_path": str(self.rvp_file) if self.rvp_file else "",
         })
 
-    def on_list_patches(self):
+    def on_list_patches(self, force_refresh: bool = False):
         if not self.cli_jar or not self.rvp_file:
             QMessageBox.information(self, "안내", "먼저 CLI/패치 번들을 다운로드하세요.")
             return
         self._pb_busy()
         self._remember_selection()
+        if self._options_timer.isActive():
+            self._update_dynamic_options()
         if not self.dynamic_option_widgets: self.reset_select = True
         self._qin.put({
             "cmd":"list_patches",
             "cli":str(self.cli_jar),
             "rvp":str(self.rvp_file),
             "pkg":self.pkg_edit.text(),
-            "inc_univ":self.include_universal.isChecked()
+            "inc_univ":self.include_universal.isChecked(),
+            "force_refresh":force_refresh
         })
 
+    def _index_entries(self):
+        self._pkgs_map = {}
+        self._idx_opts = {}
+        self._change_pkg_idx = set()
+        for e in self.entries:
+            idx = e.get("index")
+            name = e.get("name")
+            if name and name.strip().lower() == "change package name":
+                self._change_pkg_idx.add(idx)
+            packages = frozenset(p.lower() for p in e.get('packages', []))
+            if idx is not None:
+                self._pkgs_map[idx] = packages
+                option_keys = [opt['key'] for opt in e.get('options', []) if opt.get('key')]
+                if option_keys:
+                    self._idx_opts[idx] = option_keys
+            if name:
+                self._pkgs_map[name] = packages
+
+    def _items_snapshot(self) -> List[QListWidgetItem]:
+        if self._items is None:
+            lw = self.list_widget
+            self._items = [lw.item(i) for i in range(lw.count())]
+        return self._items
+
+    def _bulk_set_checked(self, items: List[QListWidgetItem], checked: List[bool]):
+        lw = self.list_widget
+        model = lw.model()
+        lw.setUpdatesEnabled(False)
+        widget_blocker = QSignalBlocker(lw)
+        model_blocker = QSignalBlocker(model)
+        changed = False
+        try:
+            for item, on in zip(items, checked):
+                state = Qt.Checked if on else Qt.Unchecked
+                if item.checkState() != state:
+                    item.setCheckState(state)
+                    changed = True
+        finally:
+            model_blocker.unblock()
+            if changed:
+                model.dataChanged.emit(model.index(0, 0), model.index(lw.count() - 1, 0), [Qt.CheckStateRole])
+            widget_blocker.unblock()
+            lw.setUpdatesEnabled(True)
+
     def open_patch_picker(self):
         if not self.entries:
             QMessageBox.information(self, "안내", "먼저 ‘패치 목록 새로고침’을 실행해 주세요.")
             return
         enabled_idx = set()
         enabled_name = set()
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
+        for item in self._items_snapshot():
             if item.checkState() == Qt.Checked:
-                m = re.match(r'^\[(\d+)\]\s+(.*)$', item.text())
-                if m:
-                    enabled_idx.add(int(m.group(1)))
-                enabled_name.add(self._extract_item_name(item.text()))
+                enabled_idx.add(item.data(_IDX_ROLE))
+                enabled_name.add(item.data(_NAME_ROLE))
         for e in self.entries:
             idx = e.get("index")
             nm  = e.get("name","")
@@ -688,37 +927,21 @@ class App(QWidget):
         dlg = PatchPickerDialog(self.entries, self)
         dlg.showMaximized()
         if dlg.exec() == QDialog.Accepted:
-            idxs, names = dlg.get_enabled()
+            idxs, _ = dlg.get_enabled()
             want = set(idxs)
-            try:
-                self.list_widget.itemChanged.disconnect(self._update_dynamic_options)
-            except RuntimeError:
-                pass
-            for i in range(self.list_widget.count()):
-                item = self.list_widget.item(i)
-                m = re.match(r'^\[(\d+)\]\s+(.*)$', item.text())
-                is_on = False
-                if m:
-                    is_on = int(m.group(1)) in want
-                else:
-                    nm = self._extract_item_name(item.text())
-                    is_on = any(nm == n or n in nm for n in names)
-                item.setCheckState(Qt.Checked if is_on else Qt.Unchecked)
-            self.list_widget.itemChanged.connect(self._update_dynamic_options)
+            items = self._items_snapshot()
+            self._bulk_set_checked(items, [item.data(_IDX_ROLE) in want for item in items])
             self._update_dynamic_options()
 
     def export_selection(self):
         path, _ = QFileDialog.getSaveFileName(self, "선택 내보내기", "patch_selection.txt", "Text (*.txt)")
         if not path: return
-        idxs=[]
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item.checkState()==Qt.Checked:
-                m = re.match(r'^\[(\d+)\]\s+', item.text())
-                if m: idxs.append(m.group(1))
-        with open(path,"w",encoding="utf-8") as f:
-            f.write("\n".join(idxs))
-        self.log.append(f"[OK] 선택 인덱스 {len(idxs)}개 내보냄 → {path}")
+        count=0
+        with open(path,"w",encoding="utf-8",buffering=1<<16) as f:
+            for item in self._items_snapshot():
+                if item.checkState()==Qt.Checked:
+                    f.write(f"{item.data(_IDX_ROLE)}\n"); count+=1
+        self.log.appendPlainText(f"[OK] 선택 인덱스 {count}개 내보냄 → {path}")
 
     def import_selection(self):
         path, _ = QFileDialog.getOpenFileName(self, "선택 불러오기", "", "Text (*.txt)")
@@ -728,28 +951,19 @@ class App(QWidget):
             for line in f:
                 line=line.strip()
                 if line.isdigit(): want.add(int(line))
-        hit=0
-        try:
-            self.list_widget.itemChanged.disconnect(self._update_dynamic_options)
-        except RuntimeError:
-            pass
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            m = re.match(r'^\[(\d+)\]\s+', item.text())
-            if m and int(m.group(1)) in want:
-                item.setCheckState(Qt.Checked); hit+=1
-            else:
-                item.setCheckState(Qt.Unchecked)
-        self.list_widget.itemChanged.connect(self._update_dynamic_options)
+        items = self._items_snapshot()
+        checked = [item.data(_IDX_ROLE) in want for item in items]
+        hit = sum(checked)
+        self._bulk_set_checked(items, checked)
         self._update_dynamic_options()
-        self.log.append(f"[OK] 불러온 인덱스 {len(want)}개 중 {hit}개 적용")
+        self.log.appendPlainText(f"[OK] 불러온 인덱스 {len(want)}개 중 {hit}개 적용")
 
     def apply_preset(self):
-        if self.list_widget.count() == 0:
+        if not self._items_snapshot():
             QMessageBox.information(self, "안내", "먼저 ‘패치 목록 새로고침’을 실행해 주세요.")
             return
         self._patches_to_check_on_load = []
-        base_pkg = self.pkg_edit.text().strip() if hasattr(self, "pkg_edit") else ""
+        base_pkg = (self.pkg_edit.text().strip() if hasattr(self, "pkg_edit") else "") or self._detected_pkg
         if not base_pkg:
             apk_path = self.apk_edit.text().strip() if hasattr(self, "apk_edit") else ""
             if apk_path and Path(apk_path).exists():
@@ -781,7 +995,7 @@ class App(QWidget):
         self.exclusive.setChecked(True)
         self.reset_select = True
         QTimer.singleShot(0, self.on_list_patches)
-        self.log.append(f"[PRESET] 프리셋 적용: pkg={base_pkg or '(미지정)'}")
+        self.log.appendPlainText(f"[PRESET] 프리셋 적용: pkg={base_pkg or '(미지정)'}")
 
     def pick_tmp_dir(self):
         path = QFileDialog.getExistingDirectory(self, "임시폴더 선택", "")
@@ -816,6 +1030,8 @@ class App(QWidget):
         self.tmp_dir_edit.setText(str(p_tmp))
 
     def on_build(self):
+        if self._options_timer.isActive():
+            self._update_dynamic_options()
         if not self.cli_jar or not self.cli_jar.exists():
             QMessageBox.information(self, "안내", "CLI .jar를 먼저 다운로드하세요."); return
         if not self.rvp_file or not self.rvp_file.exists():
@@ -824,8 +1040,8 @@ class App(QWidget):
         if not apk_path or not Path(apk_path).exists():
             QMessageBox.information(self, "안내", "APK 파일을 선택하세요."); return
             
-        path = (self.adb_path_edit.text() or "").strip()
-        self._qin.put({"cmd":"set_adb_path","path":path})
+        for op in self._sync_adb_path():
+            self._qin.put(op)
         
         in_apk = Path(apk_path)
         out_name = in_apk.stem + "-revanced.apk"
@@ -833,48 +1049,33 @@ class App(QWidget):
         
         includes_by_idx: List[int] = []
         includes_by_name: List[str] = []
-        index_to_option_keys: Dict[int, List[str]] = {}
-        name_to_option_keys: Dict[str, List[str]] = {}
-        pkgs_map: Dict[Union[int, str], List[str]] = {}
+        pkgs_map = self._pkgs_map
+        index_to_option_keys = self._idx_opts
         
-        for e in self.entries:
-            idx = e.get("index")
-            name = e.get("name")
-            packages = e.get('packages', [])
-            option_keys = [opt['key'] for opt in e.get('options', []) if opt.get('key')]
-            if idx is not None:
-                pkgs_map[idx] = packages
-                if option_keys:
-                    index_to_option_keys[idx] = option_keys
-            if name:
-                pkgs_map[name] = packages
-                if option_keys:
-                    name_to_option_keys[name] = option_keys
-                    
         current_pkg = (self.pkg_edit.text() or "").strip().lower()
         include_universal_checked = self.include_universal.isChecked()
+        exclusive_checked = self.exclusive.isChecked()
+        chpkg = self.change_pkg_input.text().strip()
+        change_pkg_enabled = False
         
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item.checkState() == Qt.Checked:
-                m = re.match(r'^\[(\d+)\]\s+(.*)$', item.text())
-                nm = self._extract_item_name(item.text())
-                idx = int(m.group(1)) if m and m.group(1).isdigit() else None
-                pkg_list_for_this_patch = []
-                identifier = idx if idx is not None else nm
-                if identifier in pkgs_map:
-                    pkg_list_for_this_patch = pkgs_map[identifier]
-                is_universal = (len(pkg_list_for_this_patch) == 0)
-                is_for_this_pkg = bool(current_pkg and current_pkg in [p.lower() for p in pkg_list_for_this_patch])
-                
-                if (include_universal_checked and is_universal) or is_for_this_pkg or not current_pkg:
-                    if idx is not None:
-                        includes_by_idx.append(idx)
-                    elif nm:
-                        includes_by_name.append(nm)
-                        
+        for it in self._items_snapshot():
+            if it.checkState() != Qt.Checked:
+                continue
+            idx, nm = it.data(_IDX_ROLE), it.data(_NAME_ROLE)
+            if idx in self._change_pkg_idx:
+                change_pkg_enabled = True
+            identifier = idx if idx is not None else nm
+            pkgs_for_this_patch = pkgs_map.get(identifier, _EMPTY_FROZENSET)
+            is_universal = not pkgs_for_this_patch
+            is_for_this_pkg = bool(current_pkg and current_pkg in pkgs_for_this_patch)
+            
+            if (include_universal_checked and is_universal) or is_for_this_pkg or not current_pkg:
+                if idx is not None:
+                    includes_by_idx.append(idx)
+                elif nm:
+                    includes_by_name.append(nm)
+                    
         all_options_values: Dict[str, Optional[str]] = {}
-        chpkg = self.change_pkg_input.text().strip()
         if chpkg:
             all_options_values["packageName"] = chpkg
         if self.update_perms.isChecked():
@@ -882,32 +1083,23 @@ class App(QWidget):
         if self.update_providers.isChecked():
             all_options_values["updateProviders"] = "true"
             
-        if chpkg:
-            change_pkg_enabled = False
-            for i in range(self.list_widget.count()):
-                item = self.list_widget.item(i)
-                if item.checkState() == Qt.Checked:
-                    nm = self._extract_item_name(item.text()).strip().lower()
-                    if nm == "change package name":
-                        change_pkg_enabled = True; break
-            if not change_pkg_enabled:
-                self.log.append("[WARN] 패키지 이름을 지정했지만 'Change package name' 패치를 적용하지 않음")
+        if chpkg and not change_pkg_enabled:
+            self.log.appendPlainText("[WARN] 패키지 이름을 지정했지만 'Change package name' 패치를 적용하지 않음")
                 
         for widget_key, widget in self.dynamic_option_widgets.items():
             value = ""
             is_composite = widget.property("is_composite")
             if is_composite:
-                combo = widget.property("combo_widget")
-                line_edit = widget.property("line_edit_widget")
-                custom_option_text = "직접 입력..."
-                if combo.currentText() == custom_option_text:
+                combo_text = widget.property("combo_widget").currentText()
+                if combo_text == _CUSTOM_OPTION_TEXT:
+                    line_edit = widget.property("line_edit_widget")
                     value = line_edit.text().strip()
                     is_list = line_edit.property("is_list_type")
                     if is_list:
                         stripped_value = value.strip().strip('[]').strip()
                         value = f"[{stripped_value}]"
                 else:
-                    value = combo.currentText().split(' ')[0]
+                    value = combo_text.split(' ')[0]
             elif isinstance(widget, QLineEdit):
                 value = widget.text().strip()
                 is_list = widget.property("is_list_type")
@@ -924,31 +1116,22 @@ class App(QWidget):
                 except IndexError:
                     pass
                     
-        cmdline = ["java","-jar",str(self.cli_jar),"patch","-p",str(self.rvp_file),"--purge"]
-        if self.exclusive.isChecked():
-            cmdline.append("--exclusive")
-            
-        used_option_keys = set()
+        remaining_opts = dict(all_options_values)
+        idx_args: List[str] = []
         for idx in includes_by_idx:
-            cmdline.extend(["--ei", str(idx)])
-            if idx in index_to_option_keys:
-                for key in index_to_option_keys[idx]:
-                    if key in all_options_values:
-                        value = all_options_values[key]
-                        if value in (None, ""):
-                            cmdline.append(f"-O{key}")
-                        else:
-                            cmdline.append(f"-O{key}={value}")
-                        used_option_keys.add(key)
-        for name in includes_by_name:
-            cmdline.extend(["-e", name])
-            
-        for key, value in all_options_values.items():
-            if key not in used_option_keys:
-                if value in (None, ""):
-                    cmdline.append(f"-O{key}")
-                else:
-                    cmdline.append(f"-O{key}={value}")
+            idx_args += ("--ei", str(idx))
+            for key in index_to_option_keys.get(idx, ()):
+                value = all_options_values.get(key, _MISSING)
+                if value is not _MISSING:
+                    idx_args.append(_option_arg(key, value))
+                    remaining_opts.pop(key, None)
+        cmdline = [
+            "java","-jar",str(self.cli_jar),"patch","-p",str(self.rvp_file),"--purge",
+            *(["--exclusive"] if exclusive_checked else []),
+            *idx_args,
+            *(a for name in includes_by_name for a in ("-e", name)),
+            *(_option_arg(k, v) for k, v in remaining_opts.items()),
+        ]
                     
         keystore = self.keystore_edit.text().strip()
         ks_pass = self.ks_pass.text().strip()
@@ -986,7 +1169,7 @@ class App(QWidget):
             "cmd":"build",
             "cli":str(self.cli_jar), "rvp":str(self.rvp_file), "apk":str(in_apk),
             "out_apk":str(out_apk),
-            "exclusive":self.exclusive.isChecked(),
+            "exclusive":exclusive_checked,
             "includes_by_idx": includes_by_idx,
             "includes_by_name": includes_by_name,
             "options": all_options_values,
@@ -998,4 +1181,4 @@ class App(QWidget):
             "tmp_base":str(p_tmp),
             "adb_install":self.adb_install_check.isChecked(),
         })
-        self.log.append("[RUN] 빌드 시작")
\ No newline at end of file
+        self.log.appendPlainText("[RUN] 빌드 시작")
\ No newline at end of file
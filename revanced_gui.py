@@ -1,16 +1,18 @@
 import os, sys, platform, ctypes
+import multiprocessing as mp
 from pathlib import Path
-from multiprocessing import Process, Queue, freeze_support
+from multiprocessing import freeze_support
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QGuiApplication, QFont
-from PySide6.QtCore import Qt
-
-from gui import App
-from worker import worker_loop
-from utils import setup_pretendard_font
+from worker_main import worker_entry
 
 def main():
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtGui import QGuiApplication, QFont
+    from PySide6.QtCore import Qt
+
+    from gui import App, FontLoader
+    from utils import setup_pretendard_font
+
     os.environ.setdefault("PYTHONIOENCODING", "utf-8")
     if sys.platform == 'win32':
         try:
@@ -34,13 +36,21 @@ def main():
     app = QApplication(sys.argv)
     
     font_dir = Path.cwd() / "output" / "fonts"
-    if setup_pretendard_font(font_dir):
+    def apply_font() -> bool:
+        if not setup_pretendard_font(font_dir):
+            return False
         app.setFont(QFont("Pretendard Variable SemiBold", 11))
+        return True
+    if not apply_font():
+        font_loader = FontLoader(app)
+        font_loader.ready.connect(apply_font, Qt.QueuedConnection)
+        font_loader.start(font_dir)
     
-    q_in = Queue()
-    q_out = Queue()
+    ctx = mp.get_context("spawn")
+    q_in = ctx.Queue()
+    q_out = ctx.Queue()
     
-    worker = Process(target=worker_loop, args=(q_in, q_out,), daemon=True)
+    worker = ctx.Process(target=worker_entry, args=(q_in, q_out,), daemon=True)
     worker.start()
     
     w = App(q_in, q_out)
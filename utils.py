@@ -1,18 +1,31 @@
-import os, re, shutil, subprocess, platform, time, ctypes, stat, urllib.request, zipfile
+import os, re, shutil, subprocess, platform, time, ctypes, stat, zipfile, queue, threading, functools, struct, json, hashlib, tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import List, Dict, Tuple, Optional
 from multiprocessing import Queue
 
-import requests
-from PySide6.QtWidgets import QFormLayout
-
 CLI_RELEASE_URL = 'https://github.com/ReVanced/revanced-cli/releases/latest'
 PATCHES_RELEASE_URL = 'https://github.com/ReVanced/revanced-patches/releases/latest'
 PLATFORM_TOOLS_WIN_ZIP = "https://dl.google.com/android/repository/platform-tools-latest-windows.zip"
 PLATFORM_TOOLS_MAC_ZIP = "https://dl.google.com/android/repository/platform-tools-latest-darwin.zip"
 PLATFORM_TOOLS_LINUX_ZIP = "https://dl.google.com/android/repository/platform-tools-latest-linux.zip"
 
+_CACHE_DIR = Path(os.environ.get("LOCALAPPDATA") or Path.home() / ".cache") / "revanced-gui"
+
+_HTTP = None
+
+def _http():
+    global _HTTP
+    if _HTTP is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        _HTTP = requests.Session()
+        _HTTP.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        _HTTP.headers.update({"User-Agent": "revanced-gui"})
+    return _HTTP
+
 _WIN_NO_WINDOW = 0
 if platform.system().lower() == "windows":
     try:
@@ -21,6 +34,8 @@ if platform.system().lower() == "windows":
         _WIN_NO_WINDOW = 0
 
 def _safe_decode(b: bytes, encodings=("utf-8", "cp949", "euc-kr")) -> str:
+    if b.isascii():
+        return b.decode("ascii")
     for enc in encodings:
         try:
             return b.decode(enc)
@@ -38,19 +53,40 @@ def _ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
 def _dir_is_empty(p: Path) -> bool:
-    if not p.exists():
-        return True
-    if not p.is_dir():
-        return False
     try:
-        next(p.iterdir())
-        return False
-    except StopIteration:
+        with os.scandir(p) as it:
+            return next(it, None) is None
+    except FileNotFoundError:
         return True
+    except NotADirectoryError:
+        return False
+
+_ENV_CACHE_TTL = 30.0
+_ENV_CACHE: Dict[str, Tuple[float, int, object]] = {}
+_env_refresh_done = False
+
+def _env_ttl_cache(fn):
+    @functools.wraps(fn)
+    def wrapper():
+        hit = _ENV_CACHE.get(fn.__name__)
+        if hit and hit[1] == hash(os.environ.get("PATH", "")) and time.monotonic() - hit[0] < _ENV_CACHE_TTL:
+            return hit[2]
+        val = fn()
+        _ENV_CACHE[fn.__name__] = (time.monotonic(), hash(os.environ.get("PATH", "")), val)
+        return val
+    return wrapper
+
+def invalidate_env_cache():
+    global _env_refresh_done, _java_bins_cache
+    _ENV_CACHE.clear()
+    _env_refresh_done = False
+    _java_bins_cache = None
 
 def _refresh_windows_env_from_registry():
-    if _os_name() != "windows":
+    global _env_refresh_done
+    if _os_name() != "windows" or _env_refresh_done:
         return
+    _env_refresh_done = True
     try:
         import winreg
         def _read_env(root):
@@ -75,23 +111,53 @@ def _refresh_windows_env_from_registry():
     except Exception:
         pass
 
-def _iter_windows_java_bins():
+_RE_JAVA_DIR = re.compile(r'(?i)^(jdk|jre)')
+_java_bins_cache: Optional[Tuple[Path, ...]] = None
+
+def _java_bin_in(d: str) -> Optional[Path]:
+    exe = os.path.join(d, "bin", "java.exe")
+    low = exe.lower()
+    if "graalvm" in low or "mandrel" in low or not os.path.isfile(exe):
+        return None
+    return Path(exe)
+
+def _iter_windows_java_bins() -> Tuple[Path, ...]:
+    global _java_bins_cache
+    if _java_bins_cache is not None:
+        return _java_bins_cache
     roots = [
-        Path(r"C:\Program Files\Eclipse Adoptium"),
-        Path(r"C:\Program Files\Java"),
-        Path(r"C:\Program Files\Microsoft"),
-        Path(r"C:\Program Files\Zulu"),
+        r"C:\Program Files\Eclipse Adoptium",
+        r"C:\Program Files\Java",
+        r"C:\Program Files\Microsoft",
+        r"C:\Program Files\Zulu",
     ]
-    sub_patterns = ["**/jdk*/bin/java.exe", "**/jre*/bin/java.exe"]
+    found: List[Path] = []
     for root in roots:
-        if not root.exists():
+        try:
+            it = os.scandir(root)
+        except OSError:
             continue
-        for pat in sub_patterns:
-            for p in root.glob(pat):
-                low = str(p).lower()
-                if "graalvm" in low or "mandrel" in low:
+        with it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                if _RE_JAVA_DIR.match(entry.name):
+                    p = _java_bin_in(entry.path)
+                    if p:
+                        found.append(p)
                     continue
-                yield p
+                try:
+                    sub = os.scandir(entry.path)
+                except OSError:
+                    continue
+                with sub:
+                    for e2 in sub:
+                        if _RE_JAVA_DIR.match(e2.name) and e2.is_dir():
+                            p = _java_bin_in(e2.path)
+                            if p:
+                                found.append(p)
+    _java_bins_cache = tuple(found)
+    return _java_bins_cache
 
 def _iter_windows_git_bins():
     candidates = [
@@ -104,11 +170,29 @@ def _iter_windows_git_bins():
         if p.exists():
             yield p
 
-def _prepend_to_path(p: Path):
-    s = str(p)
+_PREPENDED: set = set()
+_PREPENDED_FOR: Optional[str] = None
+
+def _prepend_dirs_to_path(dirs):
+    global _PREPENDED_FOR
     cur = os.environ.get("PATH", "")
-    if s.lower() not in cur.lower():
-        os.environ["PATH"] = s + (";" + cur if cur else "")
+    if cur != _PREPENDED_FOR:
+        _PREPENDED.clear()
+        _PREPENDED.update(e.lower() for e in cur.split(os.pathsep) if e)
+    fresh = []
+    for d in dirs:
+        s = str(d)
+        if s.lower() not in _PREPENDED:
+            _PREPENDED.add(s.lower())
+            fresh.append(s)
+    if fresh:
+        fresh.reverse()
+        cur = os.pathsep.join(fresh) + (os.pathsep + cur if cur else "")
+        os.environ["PATH"] = cur
+    _PREPENDED_FOR = cur
+
+def _prepend_to_path(p: Path):
+    _prepend_dirs_to_path((p,))
 
 def _ensure_adb_on_path_posix(extra_dirs: List[Path]):
     cur = os.environ.get("PATH", "")
@@ -129,19 +213,73 @@ def _find_adb_in_tools() -> Optional[str]:
                 return str(p)
     return None
 
-def _run_capture(cmd, cwd=None, env=None) -> Tuple[int, str, str]:
-    p = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=_WIN_NO_WINDOW)
-    out_b, err_b = p.communicate()
-    return p.returncode, _safe_decode(out_b), _safe_decode(err_b)
+_CAPTURE_CHUNK = 1 << 16
+
+def _drain_into(stream, buf: bytearray):
+    with stream:
+        read = stream.read
+        while True:
+            chunk = read(_CAPTURE_CHUNK)
+            if not chunk:
+                break
+            buf += chunk
+
+def _run_capture(cmd, cwd=None, env=None, merge_stderr: bool = True) -> Tuple[int, str, str]:
+    err_pipe = subprocess.STDOUT if merge_stderr else subprocess.PIPE
+    p = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=err_pipe, creationflags=_WIN_NO_WINDOW)
+    out_buf, err_buf = bytearray(), bytearray()
+    err_t = None
+    if not merge_stderr:
+        err_t = threading.Thread(target=_drain_into, args=(p.stderr, err_buf), daemon=True)
+        err_t.start()
+    _drain_into(p.stdout, out_buf)
+    if err_t:
+        err_t.join()
+    return p.wait(), _safe_decode(out_buf), _safe_decode(err_buf)
+
+_LOG_BATCH_MAX = 64
+_LOG_BATCH_SECS = 0.05
+
+def _pump_log_batched(stream, out_q: Queue, prefix: str = "", tail: Optional[deque] = None):
+    pending: "queue.Queue[Optional[bytes]]" = queue.Queue()
+    def _reader():
+        for raw in iter(stream.readline, b''):
+            pending.put(raw)
+        pending.put(None)
+    threading.Thread(target=_reader, daemon=True).start()
+    buf: List[str] = []
+    last = time.monotonic()
+    while True:
+        try:
+            raw = pending.get(timeout=_LOG_BATCH_SECS)
+        except queue.Empty:
+            raw = b""
+        if raw is None:
+            break
+        if raw:
+            line = _safe_decode(raw).rstrip("\r\n")
+            if tail is not None:
+                tail.append(line)
+            buf.append(prefix + line)
+        if buf and (not raw or len(buf) >= _LOG_BATCH_MAX or time.monotonic() - last >= _LOG_BATCH_SECS):
+            out_q.put({"type":"log_batch","lines":buf})
+            buf = []
+            last = time.monotonic()
+    if buf:
+        out_q.put({"type":"log_batch","lines":buf})
 
 def _run_stream_worker(cmd, out_q: Queue, cwd=None, env=None) -> int:
     proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0, creationflags=_WIN_NO_WINDOW)
-    for raw in iter(proc.stdout.readline, b''):
-        if not raw:
-            break
-        out_q.put({"type":"log","text":_safe_decode(raw).rstrip("\r\n")})
+    _pump_log_batched(proc.stdout, out_q)
     return proc.wait()
 
+def _run_stream(cmd, out_q: Queue, tag: str = "", keep: int = 50, cwd=None, env=None) -> Tuple[int, str, str]:
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, creationflags=_WIN_NO_WINDOW)
+    prefix = f"[{tag}] " if tag else ""
+    tail = deque(maxlen=keep)
+    _pump_log_batched(proc.stdout, out_q, prefix, tail)
+    return proc.wait(), "\n".join(tail), ""
+
 def _is_graalvm_runtime(info_text: str, java_path: Optional[str] = None) -> bool:
     t = (info_text or "").lower()
     if "graalvm" in t or "mandrel" in t:
@@ -152,25 +290,55 @@ def _is_graalvm_runtime(info_text: str, java_path: Optional[str] = None) -> bool
             return True
     return False
 
+_RE_JAVA_VERSION = re.compile(r'\bversion "([^"]+)"')
+_RE_JAVA_RELEASE_VERSION = re.compile(r'^JAVA_VERSION="([^"]+)"', re.M)
+_RE_JAVA_RELEASE_IMPLEMENTOR = re.compile(r'^IMPLEMENTOR="([^"]+)"', re.M)
+_JAVA_PROBE_CACHE: Dict[Tuple[str, float], Tuple[str, Optional[str], str]] = {}
+
+def _probe_java_version(java_path: str) -> Tuple[str, Optional[str], str]:
+    try:
+        key = (java_path, os.path.getmtime(java_path))
+    except OSError:
+        key = None
+    if key in _JAVA_PROBE_CACHE:
+        return _JAVA_PROBE_CACHE[key]
+    text, ver, raw = "", None, ""
+    try:
+        release = Path(java_path).resolve().parent.parent/"release"
+        with open(release, "rb") as f:
+            raw = _safe_decode(f.read()).strip()
+        m = _RE_JAVA_RELEASE_VERSION.search(raw)
+        if m:
+            ver = m.group(1)
+            impl = _RE_JAVA_RELEASE_IMPLEMENTOR.search(raw)
+            text = f'java version "{ver}"' + (f" ({impl.group(1)})" if impl else "")
+    except OSError:
+        pass
+    if not ver:
+        code, out, err = _run_capture([java_path, "-version"])
+        text = raw = (out or err or "").strip()
+        m = _RE_JAVA_VERSION.search(text)
+        ver = m.group(1) if m else None
+    if key is not None:
+        _JAVA_PROBE_CACHE[key] = (text, ver, raw)
+    return text, ver, raw
+
+@_env_ttl_cache
 def _has_java_ok() -> Tuple[bool, str, Optional[int]]:
     java_path = _which("java")
     if not java_path and _os_name() == "windows":
         _refresh_windows_env_from_registry()
         java_path = _which("java")
     if not java_path and _os_name() == "windows":
-        for p in _iter_windows_java_bins():
-            _prepend_to_path(p.parent)
+        _prepend_dirs_to_path(p.parent for p in _iter_windows_java_bins())
     java_path = _which("java")
     if not java_path:
         return False, "java 미발견", None
-    code, out, err = _run_capture([java_path, "-version"])
-    text = (out or err or "").strip()
-    if _is_graalvm_runtime(text, java_path):
+    text, ver, raw = _probe_java_version(java_path)
+    if _is_graalvm_runtime(raw, java_path):
         return False, text + "\n[GraalVM/ Mandrel 감지됨 → 오류 가능성 있음]", None
-    m = re.search(r'\bversion "([^"]+)"', text)
-    if not m:
+    if not ver:
         return False, text, None
-    ver = m.group(1)
     parts = ver.split(".")
     if parts[0] == "1" and len(parts) > 1:
         major = int(re.match(r"\d+", parts[1]).group(0))
@@ -179,6 +347,7 @@ def _has_java_ok() -> Tuple[bool, str, Optional[int]]:
     ok = (17 <= major < 25)
     return ok, text, major if ok else None
 
+@_env_ttl_cache
 def _has_git() -> bool:
     g = _which("git")
     if g:
@@ -188,8 +357,7 @@ def _has_git() -> bool:
         g = _which("git")
         if g:
             return True
-        for p in _iter_windows_git_bins():
-            _prepend_to_path(p.parent)
+        _prepend_dirs_to_path(p.parent for p in _iter_windows_git_bins())
         return _which("git") is not None
     return False
 
@@ -210,17 +378,15 @@ def _ensure_adb_on_path_windows():
         Path(r"C:\Program Files (x86)\Android\platform-tools"),
         Path(r"C:\Program Files\Android\platform-tools"),
     ]
-    for p in candidates:
-        if p.exists():
-            _prepend_to_path(p)
+    _prepend_dirs_to_path(p for p in candidates if p.exists())
 
 def _winget_install_or_ok(id_str: str, out_q: Queue) -> bool:
     code = _run_stream_worker([
         "winget","install","--id",id_str,"-e","--silent","--accept-package-agreements","--accept-source-agreements","--disable-interactivity","--source","winget"
     ], out_q)
+    invalidate_env_cache()
     _refresh_windows_env_from_registry()
-    for p in _iter_windows_java_bins():
-        _prepend_to_path(p.parent)
+    _prepend_dirs_to_path(p.parent for p in _iter_windows_java_bins())
     if "java" in id_str.lower():
         ok_now, _, _ = _has_java_ok()
         if ok_now:
@@ -240,7 +406,7 @@ def _find_temurin_msi_url(out_q: Queue) -> Optional[str]:
     ]
     for params in tries:
         try:
-            r = requests.get(base, params=params, timeout=30)
+            r = _http().get(base, params=params, timeout=30)
             r.raise_for_status()
             assets = r.json()
         except Exception as e:
@@ -258,25 +424,32 @@ def _find_temurin_msi_url(out_q: Queue) -> Optional[str]:
                     return link2
     return None
 
+_DL_CHUNK = 1024*1024
+_DL_PROGRESS_SECS = 0.1
+
 def _download_file(url: str, dest_path: Path, out_q: Queue, target_key: str, retries: int=3):
     _ensure_dir(dest_path.parent)
     for attempt in range(1, retries+1):
         try:
-            with requests.get(url, stream=True, timeout=(5, 60)) as r:
+            with _http().get(url, stream=True, timeout=(5, 60)) as r:
                 r.raise_for_status()
                 total = int(r.headers.get('Content-Length', 0))
                 done = 0
-                with open(dest_path, 'wb') as f:
-                    for chunk in r.iter_content(1024*64):
+                last_mark, last_t = -1, 0.0
+                with open(dest_path, 'wb', buffering=_DL_CHUNK) as f:
+                    for chunk in r.iter_content(_DL_CHUNK):
                         if not chunk:
                             continue
                         f.write(chunk); done += len(chunk)
+                        mark = int(done * 100 / total) if total else done >> 20
+                        now = time.monotonic()
+                        if mark == last_mark or (now - last_t < _DL_PROGRESS_SECS and not (total and done >= total)):
+                            continue
+                        last_mark, last_t = mark, now
                         if total:
-                            pct = int(done * 100 / total)
-                            out_q.put({"type":"progress","phase":"download","target":target_key,"value":pct,"done":done,"total":total})
+                            out_q.put({"type":"progress","phase":"download","target":target_key,"value":mark,"done":done,"total":total})
                         else:
-                            if done % (1024*1024) == 0:
-                                out_q.put({"type":"log","text":f"[DL] {done} bytes"})
+                            out_q.put({"type":"log","text":f"[DL] {done} bytes"})
             out_q.put({"type":"log","text":f"[OK] {dest_path.name} → {dest_path}"})
             return
         except Exception as e:
@@ -326,9 +499,28 @@ def _get_latest_release(url: str):
         api_url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
     else:
         api_url = url
-    r = requests.get(api_url, timeout=30)
-    r.raise_for_status()
-    data = r.json()
+    cache_path = _CACHE_DIR / (hashlib.sha1(api_url.encode("utf-8")).hexdigest() + ".json")
+    cached = None
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        pass
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+    r = _http().get(api_url, headers=headers, timeout=30)
+    if r.status_code == 304 and cached:
+        data = cached["data"]
+    else:
+        r.raise_for_status()
+        data = r.json()
+        etag = r.headers.get("ETag")
+        if etag:
+            try:
+                _ensure_dir(_CACHE_DIR)
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump({"etag": etag, "data": data}, f)
+            except OSError:
+                pass
     return data.get('tag_name') or '', data.get('assets') or []
 
 def _asset_download_url(asset: dict) -> str:
@@ -358,45 +550,89 @@ def _pick_patches_rvp_download_url(assets):
     return None, None
 
 def _run_cli_list_patches(cli_jar: Path, rvp_path: Path) -> str:
-    code, out, err = _run_capture(["java","-jar",str(cli_jar),"list-patches","--with-packages","--with-versions","--with-options",str(rvp_path)])
+    code, out, err = _run_capture(["java","-jar",str(cli_jar),"list-patches","--with-packages","--with-versions","--with-options",str(rvp_path)], merge_stderr=False)
     if code != 0:
         raise RuntimeError(f"list-patches 실패\n{err or out}")
     return out
 
-def _clear_form_layout(form_layout: QFormLayout):
-    while form_layout.count():
-        item = form_layout.takeAt(0)
-        w = item.widget()
-        l = item.layout()
-        if w:
-            w.deleteLater()
-        if l:
-            while l.count():
-                ci = l.takeAt(0)
-                if ci.widget():
-                    ci.widget().deleteLater()
+_PATCHES_CACHE_KEEP = 5
+
+def _prune_patches_cache(cache_dir: Path, keep: int = _PATCHES_CACHE_KEEP):
+    files = []
+    for p in cache_dir.glob("*.txt"):
+        try:
+            files.append((p.stat().st_mtime, p))
+        except OSError:
+            pass
+    files.sort(reverse=True)
+    for _, p in files[keep:]:
+        try:
+            p.unlink()
+        except OSError:
+            pass
+
+def _run_cli_list_patches_cached(cli_jar: Path, rvp_path: Path, force_refresh: bool = False) -> str:
+    try:
+        st_c, st_r = cli_jar.stat(), rvp_path.stat()
+        key = f"{cli_jar.name}|{st_c.st_size}|{st_c.st_mtime_ns}|{rvp_path.name}|{st_r.st_size}|{st_r.st_mtime_ns}"
+        cache_file = _CACHE_DIR / "patches" / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".txt")
+    except OSError:
+        return _run_cli_list_patches(cli_jar, rvp_path)
+    if not force_refresh:
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            pass
+    text = _run_cli_list_patches(cli_jar, rvp_path)
+    try:
+        _ensure_dir(cache_file.parent)
+        fd, tmp = tempfile.mkstemp(dir=str(cache_file.parent), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, cache_file)
+        _prune_patches_cache(cache_file.parent)
+    except OSError:
+        pass
+    return text
+
+_RE_BLANK = re.compile(r'\n{2,}')
+_RE_OPTIONS = re.compile(r'(?m)^\s*Options:\s*$')
+_RE_INDEX = re.compile(r'(?mi)^\s*(?:정보:\s*)?Index:\s*(\d+)\s*$')
+_RE_NAME = re.compile(r'(?mi)^\s*Name:\s*(.+?)\s*$')
+_RE_DESC = re.compile(r'(?ms)^\s*Description:\s*(.+?)(?=\n\s*(?:[A-Z][a-z]+:|\Z))')
+_RE_ENABLED = re.compile(r'(?mi)^\s*Enabled:\s*(true|false)\s*$')
+_RE_PKGS = re.compile(r'(?ms)^(?:Packages?|Compatible packages?):\s*(.+?)(?:\n[A-Z][A-Za-z ]+?:|\Z)')
+_RE_PKG_TOKEN = re.compile(r'\b[a-zA-Z0-9_]+(?:\.[a-zA-Z0-9_]+)+\b')
+_RE_OPT_SPLIT = re.compile(r'(?m)(?=\n\s*Title:)')
+_RE_OPT_TITLE = re.compile(r'(?m)^\s*Title:\s*(.+)')
+_RE_OPT_REQUIRED = re.compile(r'(?m)^\s*Required:\s*(.+)')
+_RE_OPT_KEY = re.compile(r'(?m)^\s*Key:\s*(.+)')
+_RE_OPT_TYPE = re.compile(r'(?m)^\s*Type:\s*(.+)')
+_RE_OPT_DEFAULT = re.compile(r'(?m)^\s*Default:\s*([^\n\r]+)')
+_RE_OPT_VALUES = re.compile(r'(?ms)^\s*Possible values:\s*\n(.+?)(?=\n\s*(?:[A-Z][a-z]+:|\Z))')
 
 def _parse_patches(text: str):
     entries = []
-    for blk in re.split(r'\n{2,}', text.strip()):
+    for blk in _RE_BLANK.split(text.strip()):
         if not blk.strip():
             continue
         patch_dict = {}
         main_info_text = blk
         options_text = None
-        options_match = re.search(r'(?m)^\s*Options:\s*$', blk)
+        options_match = _RE_OPTIONS.search(blk)
         if options_match:
             main_info_text = blk[:options_match.start()].strip()
             options_text = blk[options_match.end():].strip()
-        mi = re.search(r'(?mi)^\s*(?:정보:\s*)?Index:\s*(\d+)\s*$', main_info_text)
-        mn = re.search(r'(?mi)^\s*Name:\s*(.+?)\s*$', main_info_text)
-        md = re.search(r'(?ms)^\s*Description:\s*(.+?)(?=\n\s*(?:[A-Z][a-z]+:|\Z))', main_info_text)
-        me = re.search(r'(?mi)^\s*Enabled:\s*(true|false)\s*$', main_info_text)
-        mp = re.search(r'(?ms)^(?:Packages?|Compatible packages?):\s*(.+?)(?:\n[A-Z][A-Za-z ]+?:|\Z)', main_info_text) or re.search(r'(?ms)^(?:Packages?|Compatible packages?):\s*(.+?)(?:\n[A-Z][A-Za-z ]+?:|\Z)', blk)
+        mi = _RE_INDEX.search(main_info_text)
+        mn = _RE_NAME.search(main_info_text)
+        md = _RE_DESC.search(main_info_text)
+        me = _RE_ENABLED.search(main_info_text)
+        mp = _RE_PKGS.search(main_info_text) or _RE_PKGS.search(blk)
         pkgs = []
         if mp:
             body = mp.group(1)
-            pkgs = re.findall(r'\b[a-zA-Z0-9_]+(?:\.[a-zA-Z0-9_]+)+\b', body)
+            pkgs = [m.group(0) for m in _RE_PKG_TOKEN.finditer(body)]
         if not mn:
             continue
         patch_dict = {
@@ -408,25 +644,25 @@ def _parse_patches(text: str):
         }
         if options_text:
             patch_dict["options"] = []
-            option_sub_blocks = re.split(r'(?m)(?=\n\s*Title:)', options_text)
+            option_sub_blocks = _RE_OPT_SPLIT.split(options_text)
             for opt_block in option_sub_blocks:
                 opt_block = opt_block.strip()
                 if not opt_block:
                     continue
                 opt_dict = {}
-                m_title = re.search(r'(?m)^\s*Title:\s*(.+)', opt_block)
-                m_opt_desc = re.search(r'(?ms)^\s*Description:\s*(.+?)(?=\n\s*(?:[A-Z][a-z]+:|\Z))', opt_block)
-                m_req = re.search(r'(?m)^\s*Required:\s*(.+)', opt_block)
-                m_key = re.search(r'(?m)^\s*Key:\s*(.+)', opt_block)
-                m_type = re.search(r'(?m)^\s*Type:\s*(.+)', opt_block)
-                m_default = re.search(r'(?m)^\s*Default:\s*([^\n\r]+)', opt_block)
+                m_title = _RE_OPT_TITLE.search(opt_block)
+                m_opt_desc = _RE_DESC.search(opt_block)
+                m_req = _RE_OPT_REQUIRED.search(opt_block)
+                m_key = _RE_OPT_KEY.search(opt_block)
+                m_type = _RE_OPT_TYPE.search(opt_block)
+                m_default = _RE_OPT_DEFAULT.search(opt_block)
                 if m_title: opt_dict['title'] = m_title.group(1).strip()
                 if m_opt_desc: opt_dict['description'] = m_opt_desc.group(1).strip()
                 if m_req: opt_dict['required'] = (m_req.group(1).strip().lower() == 'true')
                 if m_key: opt_dict['key'] = m_key.group(1).strip()
                 if m_type: opt_dict['type'] = m_type.group(1).strip()
                 if m_default: opt_dict['default'] = m_default.group(1).strip()
-                m_pv = re.search(r'(?ms)^\s*Possible values:\s*\n(.+?)(?=\n\s*(?:[A-Z][a-z]+:|\Z))', opt_block)
+                m_pv = _RE_OPT_VALUES.search(opt_block)
                 if m_pv:
                     pv_text = m_pv.group(1)
                     pv_list = [line.strip() for line in pv_text.splitlines() if line.strip()]
@@ -436,7 +672,8 @@ def _parse_patches(text: str):
         entries.append(patch_dict)
     return entries
 
-def _find_aapt_bins() -> List[Path]:
+@_env_ttl_cache
+def _find_aapt_bins() -> Tuple[Path, ...]:
     bins = []
     for name in ("aapt","aapt.exe","aapt2","aapt2.exe"):
         p = shutil.which(name)
@@ -468,7 +705,7 @@ def _find_aapt_bins() -> List[Path]:
         s = str(p).lower()
         if s not in seen:
             seen.add(s); uniq.append(p)
-    return uniq
+    return tuple(uniq)
 
 def _run_badging_with(bin_path: Path, apk_path: Path) -> Optional[str]:
     code, out, err = _run_capture([str(bin_path),"dump","badging",str(apk_path)])
@@ -476,7 +713,76 @@ def _run_badging_with(bin_path: Path, apk_path: Path) -> Optional[str]:
     m = re.search(r"package:\s+name='([^']+)'", txt)
     return m.group(1) if m else None
 
+_AXML_STRING_POOL = 0x0001
+_AXML_START_ELEMENT = 0x0102
+_AXML_UTF8_FLAG = 0x100
+_APK_PKG_CACHE: Dict[Tuple[str, int, float], Optional[str]] = {}
+
+def _axml_string(data: bytes, pool_off: int, idx: int) -> str:
+    count, _, flags, strings_start = struct.unpack_from("<IIII", data, pool_off + 8)
+    if idx >= count:
+        return ""
+    off = pool_off + strings_start + struct.unpack_from("<I", data, pool_off + 28 + idx*4)[0]
+    if flags & _AXML_UTF8_FLAG:
+        off += 2 if data[off] & 0x80 else 1
+        n = data[off]
+        if n & 0x80:
+            n = ((n & 0x7F) << 8) | data[off+1]; off += 2
+        else:
+            off += 1
+        return data[off:off+n].decode("utf-8", errors="replace")
+    n = struct.unpack_from("<H", data, off)[0]
+    if n & 0x8000:
+        n = ((n & 0x7FFF) << 16) | struct.unpack_from("<H", data, off+2)[0]; off += 4
+    else:
+        off += 2
+    return data[off:off+n*2].decode("utf-16-le", errors="replace")
+
+def _parse_apk_package_via_zip(apk_path: Path) -> Optional[str]:
+    with zipfile.ZipFile(apk_path) as z:
+        data = z.read("AndroidManifest.xml")
+    off = struct.unpack_from("<H", data, 2)[0]
+    pool_off = None
+    while off + 8 <= len(data):
+        ctype, hsize, csize = struct.unpack_from("<HHI", data, off)
+        if ctype == _AXML_STRING_POOL:
+            pool_off = off
+        elif ctype == _AXML_START_ELEMENT and pool_off is not None:
+            ext = off + hsize
+            name_idx, attr_start, attr_size, attr_count = struct.unpack_from("<IHHH", data, ext + 4)
+            if _axml_string(data, pool_off, name_idx) != "manifest":
+                return None
+            for i in range(attr_count):
+                a = ext + attr_start + i*attr_size
+                _, aname, raw = struct.unpack_from("<III", data, a)
+                if _axml_string(data, pool_off, aname) == "package" and raw != 0xFFFFFFFF:
+                    return _axml_string(data, pool_off, raw) or None
+            return None
+        if csize <= 0:
+            break
+        off += csize
+    return None
+
 def _try_extract_package_from_apk(apk_path: Path) -> Optional[str]:
+    try:
+        st = os.stat(apk_path)
+        key = (str(apk_path), st.st_size, st.st_mtime)
+    except OSError:
+        key = None
+    if key in _APK_PKG_CACHE:
+        return _APK_PKG_CACHE[key]
+    pkg = _extract_package_from_apk(apk_path)
+    if key is not None and pkg:
+        _APK_PKG_CACHE[key] = pkg
+    return pkg
+
+def _extract_package_from_apk(apk_path: Path) -> Optional[str]:
+    try:
+        pkg = _parse_apk_package_via_zip(apk_path)
+        if pkg:
+            return pkg
+    except Exception:
+        pass
     try:
         from apkutils2 import APK
         a = APK(str(apk_path))
@@ -502,24 +808,52 @@ def _chmod_writable(p: Path):
     except Exception:
         pass
 
+def _remove_one(p: str, rm=os.unlink):
+    try:
+        rm(p)
+    except PermissionError:
+        _chmod_writable(p)
+        try: rm(p)
+        except OSError: pass
+    except OSError:
+        pass
+
+def _scan_tree(path: str, files: List[str], dirs: List[str]):
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir:
+                _scan_tree(entry.path, files, dirs)
+            else:
+                files.append(entry.path)
+    dirs.append(path)
+
+def _fast_rmtree(path: str):
+    files: List[str] = []
+    dirs: List[str] = []
+    _scan_tree(path, files, dirs)
+    if len(files) > 64:
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            list(ex.map(_remove_one, files))
+    else:
+        for fp in files:
+            _remove_one(fp)
+    for dp in dirs:
+        _remove_one(dp, os.rmdir)
+
 def _safe_rmtree_force(path: Path, max_retries: int = 10, wait_sec: float = 0.5):
     if not path.exists():
         return True
     for _ in range(max_retries):
         try:
-            for root, dirs, files in os.walk(path, topdown=False):
-                for name in files:
-                    fp = Path(root)/name
-                    _chmod_writable(fp)
-                    try: fp.unlink()
-                    except Exception: pass
-                for name in dirs:
-                    dp = Path(root)/name
-                    _chmod_writable(dp)
-                    try: dp.rmdir()
-                    except Exception: pass
-            _chmod_writable(path)
-            path.rmdir()
+            _fast_rmtree(str(path))
             if not path.exists():
                 return True
         except Exception:
@@ -551,22 +885,39 @@ def _win_set_not_content_indexed(path: Path):
     except Exception:
         pass
 
+_PRETENDARD_URL = "https://cdn.jsdelivr.net/npm/pretendard@1.3.9/dist/public/variable/PretendardVariable.ttf"
+_PRETENDARD_FILE = "PretendardVariable.ttf"
+
+def fetch_pretendard_font(font_storage_dir: Path) -> Optional[Path]:
+    font_path = font_storage_dir / _PRETENDARD_FILE
+    if font_path.exists():
+        return font_path
+    tmp_path = font_path.with_suffix(".part")
+    try:
+        font_storage_dir.mkdir(parents=True, exist_ok=True)
+        with _http().get(_PRETENDARD_URL, stream=True, timeout=(5, 60)) as r:
+            r.raise_for_status()
+            with open(tmp_path, 'wb') as out_file:
+                for chunk in r.iter_content(_DL_CHUNK):
+                    out_file.write(chunk)
+        os.replace(tmp_path, font_path)
+    except Exception:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return None
+    return font_path
+
 def setup_pretendard_font(font_storage_dir: Path) -> Optional[str]:
     from PySide6.QtGui import QFontDatabase
-    font_url = "https://cdn.jsdelivr.net/npm/pretendard@1.3.9/dist/public/variable/PretendardVariable.ttf"
-    font_filename = "PretendardVariable.ttf"
-    font_path = font_storage_dir / font_filename
-    font_storage_dir.mkdir(parents=True, exist_ok=True)
+    font_path = font_storage_dir / _PRETENDARD_FILE
     if not font_path.exists():
-        try:
-            with urllib.request.urlopen(font_url) as response, open(font_path, 'wb') as out_file:
-                shutil.copyfileobj(response, out_file)
-        except Exception as e:
-            return None
+        return None
     font_id = QFontDatabase.addApplicationFont(str(font_path))
     if font_id == -1:
         return None
     family_names = QFontDatabase.applicationFontFamilies(font_id)
     if not family_names:
         return None
-    return True
\ No newline at end of file
+    return True
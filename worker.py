@@ -1,5 +1,9 @@
+import queue
+import traceback
 from multiprocessing import Queue
 
+from utils import invalidate_env_cache
+
 from worker_handlers import (
     handle_set_adb_path,
     handle_env_check,
@@ -32,24 +36,63 @@ HANDLERS = {
     "adb_kill": handle_adb_kill,
 }
 
+_MINI_BATCH = 8
+_IDEMPOTENT_CMDS = frozenset({"env_check", "adb_devices", "adb_devices_silent"})
+
+def _dispatch(msg: dict, in_q: Queue, out_q: Queue):
+    cmd = msg.get("cmd")
+    handler = HANDLERS.get(cmd)
+    
+    try:
+        if handler:
+            handler(msg, out_q)
+            if cmd in ("install_java", "install_git", "install_adb"):
+                 invalidate_env_cache()
+                 in_q.put({"cmd":"env_check"})
+        else:
+            out_q.put({"type":"fail","error":f"unknown command: {cmd}"})
+    except Exception:
+        out_q.put({"type":"fail","error":f"Worker Error ({cmd}):\n{traceback.format_exc()}"})
+
+def _expand(msg: dict) -> list:
+    if msg.get("cmd") == "batch":
+        return list(msg.get("ops") or [])
+    return [msg]
+
+def _only_probes(ops: list) -> bool:
+    return all(op.get("cmd") in _IDEMPOTENT_CMDS for op in ops)
+
 def worker_loop(in_q: Queue, out_q: Queue):
     while True:
         msg = in_q.get()
         if msg is None:
             break
-            
-        cmd = msg.get("cmd")
-        handler = HANDLERS.get(cmd)
-        
-        try:
-            if handler:
-                handler(msg, out_q)
-                if cmd in ("install_java", "install_git", "install_adb"):
-                     in_q.put({"cmd":"env_check"})
+        ops = _expand(msg)
+        first = len(ops)
+        stop = False
+        while len(ops) < _MINI_BATCH and _only_probes(ops):
+            try:
+                nxt = in_q.get_nowait()
+            except queue.Empty:
+                break
+            if nxt is None:
+                stop = True
+                del ops[first:]
+                break
+            ops.extend(_expand(nxt))
+
+        seen_probes = set()
+        for op in ops:
+            cmd = op.get("cmd")
+            if cmd in _IDEMPOTENT_CMDS:
+                key = (cmd, bool(op.get("force")))
+                if key in seen_probes:
+                    continue
+                seen_probes.add(key)
             else:
-                out_q.put({"type":"fail","error":f"unknown command: {cmd}"})
-        except Exception as e:
-            import traceback
-            out_q.put({"type":"fail","error":f"Worker Error ({cmd}):\n{traceback.format_exc()}"})
-        
-        out_q.put({"type":"done"})
\ No newline at end of file
+                seen_probes.clear()
+            _dispatch(op, in_q, out_q)
+
+        out_q.put({"type":"done"})
+        if stop:
+            break
@@ -1,17 +1,19 @@
 import os
+import json
 import tempfile
 from pathlib import Path
 from multiprocessing import Queue
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from utils import (
-    _has_java_ok, _has_git, _which, _refresh_windows_env_from_registry,
-    _iter_windows_java_bins, _prepend_to_path, _iter_windows_git_bins,
+    _has_java_ok, _has_git, _which, _refresh_windows_env_from_registry, invalidate_env_cache,
+    _iter_windows_java_bins, _prepend_to_path, _prepend_dirs_to_path, _iter_windows_git_bins,
     _find_adb_in_tools, _ensure_adb_on_path_windows, _winget_install_or_ok,
     _find_temurin_msi_url, _download_file, _run_stream_worker,
     _ensure_adb_on_path_posix, _download_and_extract_zip, _make_executable,
     _get_latest_release, _pick_cli_jar_download_url, _pick_patches_rvp_download_url,
-    _try_extract_package_from_apk, _run_cli_list_patches, _parse_patches,
+    _try_extract_package_from_apk, _run_cli_list_patches_cached, _parse_patches,
     _ensure_dir, _win_set_not_content_indexed, _safe_rmtree_force,
     CLI_RELEASE_URL, PATCHES_RELEASE_URL, PLATFORM_TOOLS_WIN_ZIP,
     PLATFORM_TOOLS_MAC_ZIP, PLATFORM_TOOLS_LINUX_ZIP, _os_name
@@ -19,7 +21,8 @@ from utils import (
 
 from adb import (
     set_adb_override, get_adb_override, emit_adb_path_set, adb_start_server,
-    adb_list_devices, validate_devices_ready, adb_install, adb_exec
+    adb_list_devices, validate_devices_ready, adb_install, adb_exec,
+    close_shell_sessions, poll_devices_adaptive, reset_adb_discovery_cache
 )
 
 def handle_set_adb_path(msg: dict, out_q: Queue):
@@ -33,6 +36,9 @@ def handle_set_adb_path(msg: dict, out_q: Queue):
         emit_adb_path_set(out_q, path, Path(path).exists())
 
 def handle_env_check(msg: dict, out_q: Queue):
+    if msg.get("force"):
+        invalidate_env_cache()
+    reset_adb_discovery_cache()
     ok, out, _ = _has_java_ok()
     adb_ok = False
     adb_path = None
@@ -43,7 +49,7 @@ def handle_env_check(msg: dict, out_q: Queue):
         adb_ok = True
     else:
         tools_adb = _find_adb_in_tools()
-        if tools_adb and Path(tools_adb).exists():
+        if tools_adb:
             set_adb_override(tools_adb)
             adb_path = tools_adb
             adb_ok = True
@@ -63,7 +69,6 @@ def handle_env_check(msg: dict, out_q: Queue):
     if adb_path:
         emit_adb_path_set(out_q, adb_path, True)
         
-    adb_start_server(out_q)
     devs, raw = adb_list_devices()
     if validate_devices_ready(devs, out_q, context="env_check"):
         out_q.put({"type":"adb_devices","devices":devs,"raw":raw})
@@ -73,8 +78,7 @@ def handle_install_java(msg: dict, out_q: Queue):
         out_q.put({"type":"log","text":"winget Temurin 17 실행"})
         ok_by_winget = _winget_install_or_ok("EclipseAdoptium.Temurin.17.JDK", out_q)
         _refresh_windows_env_from_registry()
-        for p in _iter_windows_java_bins():
-            _prepend_to_path(p.parent)
+        _prepend_dirs_to_path(p.parent for p in _iter_windows_java_bins())
         ok_now, _, _ = _has_java_ok()
         if ok_by_winget or ok_now:
             return
@@ -88,8 +92,9 @@ def handle_install_java(msg: dict, out_q: Queue):
         _download_file(msi_url, msi_path, out_q, target_key="java-msi")
         code = _run_stream_worker(["msiexec","/i",str(msi_path),"/qn"], out_q)
         if code==0:
+            invalidate_env_cache()
             _refresh_windows_env_from_registry()
-            for p in _iter_windows_java_bins(): _prepend_to_path(p.parent)
+            _prepend_dirs_to_path(p.parent for p in _iter_windows_java_bins())
         else:
             out_q.put({"type":"fail","error":f"msiexec code={code}"})
     elif _os_name()=="darwin" and _which("brew"):
@@ -113,9 +118,10 @@ def handle_install_java(msg: dict, out_q: Queue):
 def handle_install_git(msg: dict, out_q: Queue):
     if _os_name()=="windows" and _which("winget"):
         code = _run_stream_worker(["winget","install","--id","Git.Git","-e","--silent","--accept-package-agreements","--accept-source-agreements","--disable-interactivity","--source","winget"], out_q)
+        invalidate_env_cache()
         if code==0 or _has_git():
             _refresh_windows_env_from_registry()
-            for p in _iter_windows_git_bins(): _prepend_to_path(p.parent)
+            _prepend_dirs_to_path(p.parent for p in _iter_windows_git_bins())
         else:
             out_q.put({"type":"fail","error":f"winget git code={code}"})
     elif _os_name()=="darwin" and _which("brew"):
@@ -140,7 +146,7 @@ def handle_install_adb(msg: dict, out_q: Queue):
             existing_adb = current_override
         else:
             found = _find_adb_in_tools()
-            if found and Path(found).exists():
+            if found:
                 existing_adb = found
             else:
                 sys_adb = _which("adb")
@@ -200,6 +206,7 @@ def handle_download_components(msg: dict, out_q: Queue):
 
     cli_path = (msg.get("cli_path") or "").strip()
     rvp_path = (msg.get("rvp_path") or "").strip()
+    jobs = []
     
     if user_cli_url or not cli_path:
         if user_cli_url and not user_cli_url.endswith(("latest", "releases")):
@@ -212,7 +219,7 @@ def handle_download_components(msg: dict, out_q: Queue):
                 out_q.put({"type":"fail","error":"CLI .jar 없음"}); return
                 
         cli_path = out_dir / name_cli
-        _download_file(url_cli, cli_path, out_q, target_key="cli")
+        jobs.append((url_cli, cli_path, "cli"))
     
     if user_rvp_url or not rvp_path:
         if user_rvp_url and not user_rvp_url.endswith(("latest", "releases")):
@@ -225,8 +232,16 @@ def handle_download_components(msg: dict, out_q: Queue):
                 out_q.put({"type":"fail","error":".rvp 없음"}); return
                 
         rvp_path = out_dir / name_rvp
-        _download_file(url_rvp, rvp_path, out_q, target_key="rvp")
-    
+        jobs.append((url_rvp, rvp_path, "rvp"))
+
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futs = [pool.submit(_download_file, url, dest, out_q, key) for url, dest, key in jobs]
+            for fut in as_completed(futs):
+                fut.result()
+    else:
+        for url, dest, key in jobs:
+            _download_file(url, dest, out_q, target_key=key)
     out_q.put({"type":"download_ok","cli":str(cli_path),"rvp":str(rvp_path)})
 
 def handle_detect_package(msg: dict, out_q: Queue):
@@ -234,10 +249,12 @@ def handle_detect_package(msg: dict, out_q: Queue):
     pkg = _try_extract_package_from_apk(apk)
     out_q.put({"type":"pkg","value":pkg})
 
+_PATCH_FIELDS_FOR_GUI = ("index", "name", "enabled", "packages", "options")
+
 def handle_list_patches(msg: dict, out_q: Queue):
     cli = Path(msg["cli"])
     rvp = Path(msg["rvp"])
-    text = _run_cli_list_patches(cli, rvp)
+    text = _run_cli_list_patches_cached(cli, rvp, bool(msg.get("force_refresh")))
     entries = _parse_patches(text)
     pkg = (msg.get("pkg") or "").strip().lower()
     inc_univ = bool(msg.get("inc_univ"))
@@ -264,7 +281,8 @@ def handle_list_patches(msg: dict, out_q: Queue):
     else:
         rows = filter_rows(inc_univ)
         
-    out_q.put({"type":"patches","entries":rows})
+    slim = [{k: e[k] for k in _PATCH_FIELDS_FOR_GUI if k in e} for e in rows]
+    out_q.put({"type":"patches","entries_json":json.dumps(slim, ensure_ascii=False).encode("utf-8")})
 
 def handle_build(msg: dict, out_q: Queue):
     cli = Path(msg["cli"]); rvp = Path(msg["rvp"]); apk = Path(msg["apk"])
@@ -294,13 +312,11 @@ def handle_build(msg: dict, out_q: Queue):
         out_q.put({"type":"build_end"})
 
 def handle_adb_devices(msg: dict, out_q: Queue):
-    adb_start_server(out_q)
     devs, raw = adb_list_devices()
     if validate_devices_ready(devs, out_q, context="adb_devices"):
         out_q.put({"type":"adb_devices","devices":devs,"raw":raw})
 
 def handle_adb_devices_silent(msg: dict, out_q: Queue):
-    adb_start_server(out_q)
     devs, raw = adb_list_devices()
     if validate_devices_ready(devs, out_q, context="init"):
         out_q.put({"type": "adb_devices", "devices": devs, "raw": raw})
@@ -313,8 +329,7 @@ def handle_adb_install_apk(msg: dict, out_q: Queue):
     if not apk_path.exists():
         out_q.put({"type":"fail","error":"APK 경로가 유효하지 않습니다."}); return
         
-    adb_start_server(out_q)
-    devs, _ = adb_list_devices()
+    devs, _ = poll_devices_adaptive(out_q, serial)
     if not validate_devices_ready(devs, out_q, context="install"):
         return
         
@@ -331,4 +346,5 @@ def handle_adb_install_apk(msg: dict, out_q: Queue):
         out_q.put({"type":"fail","error":f"ADB 설치 실패 (code={code})\n{txt.strip()}"})
 
 def handle_adb_kill(msg: dict, out_q: Queue):
+    close_shell_sessions()
     adb_exec(["kill-server"])
\ No newline at end of file
@@ -0,0 +1,7 @@
+import sys
+from multiprocessing import Queue
+
+def worker_entry(in_q: Queue, out_q: Queue):
+    sys.modules["PySide6"] = None
+    from worker import worker_loop
+    worker_loop(in_q, out_q)